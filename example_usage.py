@@ -75,10 +75,14 @@ def demo_subtitle_processing():
         "این متن فارسی است"
     ]
     
+    # Buffer the per-text lines and emit them in one write instead of one
+    # flush per print
     print("🔍 Farsi Character Detection:")
+    out = []
     for text in test_texts:
         has_farsi = extractor._contains_farsi_chars(text)
-        print(f"  '{text}' -> {'✅ Has Farsi' if has_farsi else '❌ No Farsi'}")
+        out.append(f"  '{text}' -> {'✅ Has Farsi' if has_farsi else '❌ No Farsi'}")
+    sys.stdout.write('\n'.join(out) + '\n')
     
     # Test text cleaning
     print("\n🧹 Text Cleaning:")
@@ -89,9 +93,11 @@ def demo_subtitle_processing():
         "(Background noise) Clear speech"
     ]
     
+    out = []
     for dirty_text in dirty_texts:
         clean_text = extractor._clean_subtitle_text(dirty_text)
-        print(f"  '{dirty_text}' -> '{clean_text}'")
+        out.append(f"  '{dirty_text}' -> '{clean_text}'")
+    sys.stdout.write('\n'.join(out) + '\n')
     
     # Test subtitle statistics
     print("\n📊 Subtitle Statistics:")
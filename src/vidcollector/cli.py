@@ -7,8 +7,14 @@ from pathlib import Path
 from typing import List, Optional
 
 from .config import Config
-from .crawler import FarsiVideoCrawler
-from .database import DatabaseManager
+from .database import DatabaseManager, unpack_content
+
+# orjson serializes straight to UTF-8 bytes several times faster than the
+# stdlib; fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def create_parser() -> argparse.ArgumentParser:
     """Create command-line argument parser."""
@@ -46,6 +52,7 @@ Examples:
                              help='Skip subtitle extraction')
     crawl_parser.add_argument('--config', type=str,
                              help='Path to custom config file')
+    crawl_parser.set_defaults(func=handle_crawl_command, requires_api_key=True)
     
     # Crawl channels command
     channels_parser = subparsers.add_parser('crawl-channels', 
@@ -54,17 +61,20 @@ Examples:
                                 help='YouTube channel IDs to crawl')
     channels_parser.add_argument('--max-videos-per-channel', type=int, default=50,
                                 help='Maximum videos per channel (default: 50)')
+    channels_parser.set_defaults(func=handle_crawl_channels_command, requires_api_key=True)
     
     # Resume subtitles command
     resume_parser = subparsers.add_parser('resume-subtitles',
                                          help='Resume subtitle extraction for existing videos')
     resume_parser.add_argument('--max-videos', type=int,
                               help='Maximum number of videos to process')
+    resume_parser.set_defaults(func=handle_resume_subtitles_command, requires_api_key=True)
     
     # Statistics command
     stats_parser = subparsers.add_parser('stats', help='Show crawling statistics')
     stats_parser.add_argument('--detailed', action='store_true',
                              help='Show detailed statistics')
+    stats_parser.set_defaults(func=handle_stats_command)
     
     # Database command
     db_parser = subparsers.add_parser('db', help='Database operations')
@@ -80,6 +90,8 @@ Examples:
                               help='Output file path')
     export_parser.add_argument('--table', choices=['videos', 'subtitles', 'all'], 
                               default='all', help='Table to export (default: all)')
+
+    db_parser.set_defaults(func=handle_db_command)
     
     return parser
 
@@ -88,6 +100,10 @@ def handle_crawl_command(args) -> int:
     try:
         print("🚀 Starting VidCollector crawl...")
         
+        # Deferred: pulls in googleapiclient/yt-dlp, which offline commands
+        # should not pay for
+        from .crawler import FarsiVideoCrawler
+        
         # Initialize crawler
         crawler = FarsiVideoCrawler()
         
@@ -113,6 +129,8 @@ def handle_crawl_channels_command(args) -> int:
     try:
         print(f"🚀 Starting channel crawl for {len(args.channel_ids)} channels...")
         
+        from .crawler import FarsiVideoCrawler
+        
         # Initialize crawler
         crawler = FarsiVideoCrawler()
         
@@ -137,6 +155,8 @@ def handle_resume_subtitles_command(args) -> int:
     try:
         print("🚀 Resuming subtitle extraction...")
         
+        from .crawler import FarsiVideoCrawler
+        
         # Initialize crawler
         crawler = FarsiVideoCrawler()
         
@@ -219,40 +239,86 @@ def handle_db_command(args) -> int:
         print(f"❌ Database operation failed: {e}")
         return 1
 
+def _iter_table_rows(cursor, batch_size: int = 1000):
+    """Yield rows from a cursor in batches to keep memory usage flat."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            yield row
+
+def _export_row(row, table_name: str, lang_codes: dict) -> dict:
+    """Turn a raw table row into its export form.
+
+    Large subtitle content is zlib-compressed in storage, so it must be
+    decompressed here or JSON serialization fails on the bytes (and CSV
+    would silently write raw zlib output). The language column stores a
+    dimension-table id, which is mapped back to its 'fa'/'en' code so
+    exports stay self-describing.
+    """
+    data = dict(row)
+    if table_name == 'subtitles':
+        data['content'] = unpack_content(data['content'])
+        data['language'] = lang_codes.get(data['language'], data['language'])
+    return data
+
 def export_data(db: DatabaseManager, format_type: str, output_path: str, table: str):
-    """Export database data to file."""
+    """Export database data to file, streaming rows instead of loading all at once."""
     import sqlite3
     import csv
-    
-    data = {}
-    
+
+    tables = [t for t in ('videos', 'subtitles') if table in [t, 'all']]
+
     with sqlite3.connect(db.db_path) as conn:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
-        
-        if table in ['videos', 'all']:
-            cursor.execute('SELECT * FROM videos')
-            data['videos'] = [dict(row) for row in cursor.fetchall()]
-        
-        if table in ['subtitles', 'all']:
-            cursor.execute('SELECT * FROM subtitles')
-            data['subtitles'] = [dict(row) for row in cursor.fetchall()]
-    
-    if format_type == 'json':
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    elif format_type == 'csv':
-        output_dir = Path(output_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        for table_name, rows in data.items():
-            if rows:
+        cursor.arraysize = 1000
+
+        lang_codes = {lang_id: code for lang_id, code in
+                      conn.execute('SELECT id, code FROM languages')}
+
+        if format_type == 'json':
+            if orjson is not None:
+                dumps = orjson.dumps
+            else:
+                dumps = lambda obj: json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+            # Bytes-mode file: rows are serialized directly to UTF-8 with no
+            # intermediate str re-encoding
+            with open(output_path, 'wb') as f:
+                f.write(b'{')
+                for table_index, table_name in enumerate(tables):
+                    if table_index:
+                        f.write(b',')
+                    f.write(f'\n"{table_name}": ['.encode('ascii'))
+                    cursor.execute(f'SELECT * FROM {table_name}')
+                    for row_index, row in enumerate(_iter_table_rows(cursor)):
+                        if row_index:
+                            f.write(b',')
+                        f.write(b'\n')
+                        f.write(dumps(_export_row(row, table_name, lang_codes)))
+                    f.write(b'\n]')
+                f.write(b'\n}\n')
+
+        elif format_type == 'csv':
+            output_dir = Path(output_path).parent
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            for table_name in tables:
+                cursor.execute(f'SELECT * FROM {table_name}')
+                first_batch = cursor.fetchmany(1000)
+                if not first_batch:
+                    continue
+
                 csv_path = output_dir / f"{Path(output_path).stem}_{table_name}.csv"
                 with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+                    writer = csv.DictWriter(f, fieldnames=first_batch[0].keys())
                     writer.writeheader()
-                    writer.writerows(rows)
+                    writer.writerows(_export_row(row, table_name, lang_codes)
+                                     for row in first_batch)
+                    writer.writerows(_export_row(row, table_name, lang_codes)
+                                     for row in _iter_table_rows(cursor))
 
 def print_stats(stats: dict):
     """Print crawling statistics in a formatted way."""
@@ -276,32 +342,22 @@ def main():
     parser = create_parser()
     args = parser.parse_args()
     
-    if not args.command:
+    if not args.command or not getattr(args, 'func', None):
         parser.print_help()
         return 1
     
-    # Validate configuration
-    try:
-        Config.validate()
-    except ValueError as e:
-        print(f"❌ Configuration error: {e}")
-        print("Please check your .env file or environment variables.")
-        return 1
+    # Validate configuration only for commands that talk to the YouTube API;
+    # stats/db work offline and should not fail for users without a key
+    if getattr(args, 'requires_api_key', False):
+        try:
+            Config.validate()
+        except ValueError as e:
+            print(f"❌ Configuration error: {e}")
+            print("Please check your .env file or environment variables.")
+            return 1
     
-    # Route to appropriate handler
-    if args.command == 'crawl':
-        return handle_crawl_command(args)
-    elif args.command == 'crawl-channels':
-        return handle_crawl_channels_command(args)
-    elif args.command == 'resume-subtitles':
-        return handle_resume_subtitles_command(args)
-    elif args.command == 'stats':
-        return handle_stats_command(args)
-    elif args.command == 'db':
-        return handle_db_command(args)
-    else:
-        parser.print_help()
-        return 1
+    # Route to the handler attached by the matched subparser
+    return args.func(args)
 
 if __name__ == '__main__':
     sys.exit(main())
\ No newline at end of file
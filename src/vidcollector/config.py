@@ -1,10 +1,28 @@
 """Configuration management for VidCollector."""
 
 import os
-from typing import List, Optional
+import unicodedata
+from typing import FrozenSet, Optional, Tuple
 from dotenv import load_dotenv
 
-load_dotenv()
+from .matcher import KeywordMatcher
+
+# Parse .env only once per process; child processes inherit the flag through
+# the environment and skip the filesystem walk entirely.
+if not os.environ.get('_VIDCOLLECTOR_ENV_LOADED'):
+    load_dotenv()
+    os.environ['_VIDCOLLECTOR_ENV_LOADED'] = '1'
+
+# Arabic-only codepoints folded to their Persian equivalents (ي/ی, ك/ک, ة/ه)
+# plus the Arabic-Indic digit block mapped onto the Extended Arabic (Persian)
+# digits, so keyword matching and dedup see one canonical form.
+_FARSI_TRANS = str.maketrans('يكة٠١٢٣٤٥٦٧٨٩', 'یکه۰۱۲۳۴۵۶۷۸۹')
+
+def normalize_farsi(text: str) -> str:
+    """Normalize text to NFC and fold Arabic codepoint variants to Persian."""
+    if not text:
+        return text
+    return unicodedata.normalize('NFC', text).translate(_FARSI_TRANS)
 
 class Config:
     """Configuration class for VidCollector."""
@@ -14,15 +32,32 @@ class Config:
     
     # Database Configuration
     DATABASE_PATH: str = os.getenv('DATABASE_PATH', 'data/farsi_videos.db')
+
+    # On-disk cache of videos.list payloads; entries older than the TTL
+    # (seconds) are refetched
+    API_CACHE_PATH: str = os.getenv('API_CACHE_PATH', 'data/api_cache.db')
+    API_CACHE_TTL: int = int(os.getenv('API_CACHE_TTL', '86400'))
+
+    # Per-query search resume tokens, survived across process restarts
+    SEARCH_STATE_PATH: str = os.getenv('SEARCH_STATE_PATH', 'data/search_state.json')
     
     # Crawler Settings
     MAX_VIDEOS_PER_SEARCH: int = int(os.getenv('MAX_VIDEOS_PER_SEARCH', '50'))
     RATE_LIMIT_DELAY: float = float(os.getenv('RATE_LIMIT_DELAY', '1.0'))
     MAX_CONCURRENT_DOWNLOADS: int = int(os.getenv('MAX_CONCURRENT_DOWNLOADS', '3'))
+    CRAWL_WORKERS: int = int(os.getenv('CRAWL_WORKERS', '4'))
     
-    # Search Configuration
-    FARSI_KEYWORDS: List[str] = os.getenv('FARSI_KEYWORDS', 'فارسی,پارسی,ایرانی,تهران,اصفهان,شیراز,مشهد').split(',')
-    CHANNEL_WHITELIST: List[str] = [ch.strip() for ch in os.getenv('CHANNEL_WHITELIST', '').split(',') if ch.strip()]
+    # Search Configuration (tuples: parsed once at import, immutable afterwards;
+    # keywords normalized so comparisons against normalized text are exact)
+    FARSI_KEYWORDS: Tuple[str, ...] = tuple(normalize_farsi(k) for k in os.getenv('FARSI_KEYWORDS', 'فارسی,پارسی,ایرانی,تهران,اصفهان,شیراز,مشهد').split(','))
+    CHANNEL_WHITELIST: Tuple[str, ...] = tuple(ch.strip() for ch in os.getenv('CHANNEL_WHITELIST', '').split(',') if ch.strip())
+    # Known-Farsi channels harvested via cheap playlist listings (2 quota
+    # units per 50 videos) before falling back to 100-unit searches
+    FARSI_SEED_CHANNELS: Tuple[str, ...] = tuple(ch.strip() for ch in os.getenv('FARSI_SEED_CHANNELS', '').split(',') if ch.strip())
+
+    # Frozen-set copies for O(1) membership tests in hot loops
+    FARSI_KEYWORDS_SET: FrozenSet[str] = frozenset(FARSI_KEYWORDS)
+    CHANNEL_WHITELIST_SET: FrozenSet[str] = frozenset(CHANNEL_WHITELIST)
     MAX_VIDEO_DURATION: int = int(os.getenv('MAX_VIDEO_DURATION', '3600'))  # 1 hour
     MIN_VIDEO_DURATION: int = int(os.getenv('MIN_VIDEO_DURATION', '60'))    # 1 minute
     
@@ -48,9 +83,29 @@ class Config:
     def max_videos_per_search(self) -> int:
         return self.MAX_VIDEOS_PER_SEARCH
     
+    @property
+    def crawl_workers(self) -> int:
+        return self.CRAWL_WORKERS
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration settings."""
         if not cls.YOUTUBE_API_KEY:
             raise ValueError("YOUTUBE_API_KEY is required")
-        return True
\ No newline at end of file
+        return True
+
+
+# Built lazily so keyword changes before first use are picked up
+_KEYWORD_MATCHER: Optional['KeywordMatcher'] = None
+
+def contains_any_farsi_keyword(text: str) -> bool:
+    """Check if text mentions any of the configured Farsi keywords.
+
+    Backed by KeywordMatcher, which tests every keyword in one linear scan
+    of the text (hyperscan's DFA when installed, a compiled alternation
+    otherwise) instead of one substring search per keyword.
+    """
+    global _KEYWORD_MATCHER
+    if _KEYWORD_MATCHER is None:
+        _KEYWORD_MATCHER = KeywordMatcher(Config.FARSI_KEYWORDS)
+    return _KEYWORD_MATCHER.contains_any(text)
\ No newline at end of file
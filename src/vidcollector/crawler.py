@@ -1,8 +1,11 @@
 """Main crawler engine for VidCollector."""
 
-import time
+import asyncio
+import atexit
 import uuid
 import logging
+import logging.handlers
+import queue
 from datetime import datetime
 from typing import Dict, List, Optional, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -15,7 +18,16 @@ from .subtitle_extractor import SubtitleExtractor
 
 class FarsiVideoCrawler:
     """Main crawler for collecting Farsi YouTube videos with subtitles."""
-    
+
+    # Flush sizes for batched database writes: large enough to amortize the
+    # per-transaction fsync, small enough that a crash loses little work.
+    VIDEO_BATCH_SIZE = 100
+    SUBTITLE_BATCH_SIZE = 50
+
+    # Per-video outcomes recorded in _video_status
+    STATUS_PROCESSED = 0
+    STATUS_FAILED = 1
+
     def __init__(self, config: Config = None):
         self.config = config or Config()
         self.config.validate()
@@ -27,8 +39,16 @@ class FarsiVideoCrawler:
         
         # Crawler state
         self.session_id = str(uuid.uuid4())
-        self.processed_videos: Set[str] = set()
-        self.failed_videos: Set[str] = set()
+
+        # One status dict instead of separate processed/failed sets; only
+        # the result consumer writes it, so nothing is mutated from worker
+        # threads
+        self._video_status: Dict[str, int] = {}
+
+        # Snapshot of stored video IDs so the dedup check is a set lookup
+        # instead of a SELECT per search result; kept current as batches
+        # are flushed
+        self._existing_ids: Set[str] = self.db.load_existing_video_ids()
         
         # Statistics
         self.stats = {
@@ -41,17 +61,43 @@ class FarsiVideoCrawler:
         
         # Setup logging
         self._setup_logging()
+
+    @property
+    def processed_videos(self) -> Set[str]:
+        """IDs attempted this session, whether they succeeded or failed."""
+        return set(self._video_status)
+
+    @property
+    def failed_videos(self) -> Set[str]:
+        """IDs whose subtitle extraction failed this session."""
+        return {video_id for video_id, status in self._video_status.items()
+                if status == self.STATUS_FAILED}
     
     def _setup_logging(self):
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=getattr(logging, self.config.LOG_LEVEL),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.config.LOG_FILE),
-                logging.StreamHandler()
-            ]
+        """Setup logging configuration.
+
+        Handlers sit behind a QueueHandler/QueueListener pair: worker
+        threads only enqueue records, and a single background thread does
+        the formatting and file/stream writes, so logging in the per-video
+        loops never blocks on the handler lock or a flush.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(self.config.LOG_FILE)
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, self.config.LOG_LEVEL))
+        root.handlers = [logging.handlers.QueueHandler(log_queue)]
+
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler
         )
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+
         self.logger = logging.getLogger(__name__)
     
     def crawl_farsi_videos(self, max_videos: int = 100, 
@@ -76,15 +122,15 @@ class FarsiVideoCrawler:
         self.db.start_crawl_session(self.session_id, search_query)
         
         try:
-            # Phase 1: Search and collect video metadata
-            self.logger.info("Phase 1: Searching for Farsi videos...")
-            videos = self._search_videos(max_videos, search_queries)
-            
-            # Phase 2: Process videos and extract subtitles
-            if extract_subtitles and videos:
-                self.logger.info("Phase 2: Extracting subtitles...")
-                self._process_videos_with_subtitles(videos)
-            
+            # Search and extraction run as one pipeline: results stream
+            # from the search generator into the subtitle consumers, so
+            # the network is busy on both fronts at once
+            self.logger.info("Crawling with pipelined search and extraction...")
+            videos = asyncio.run(self._crawl_pipeline(
+                max_videos, search_queries, extract_subtitles
+            ))
+            self.logger.info(f"Found {len(videos)} videos to process")
+
             # Update final statistics
             self.db.update_crawl_session(
                 self.session_id,
@@ -102,130 +148,235 @@ class FarsiVideoCrawler:
             self.db.update_crawl_session(self.session_id, status='failed')
             raise
     
-    def _search_videos(self, max_videos: int, search_queries: List[str] = None) -> List[Dict]:
-        """Search for videos and store metadata."""
-        videos = []
-        
+    def _store_videos(self, batch: List[Dict]) -> int:
+        """Insert a batch of videos and record their IDs as existing."""
+        stored = self.db.insert_videos_bulk(batch)
+        if stored:
+            self._existing_ids.update(video['video_id'] for video in batch)
+        return stored
+
+    def _iter_search_results(self, max_videos: int, search_queries: List[str] = None):
+        """Yield filtered search results one at a time.
+
+        Generator form so the crawl pipeline can start extracting
+        subtitles while the search is still paging through results.
+        """
+        yielded = 0
+
         try:
             if search_queries:
                 # Use custom search queries
                 videos_per_query = max(1, max_videos // len(search_queries))
-                
+
                 for query in search_queries:
                     self.logger.info(f"Searching for: {query}")
-                    
+
                     for video in self.youtube_api.search_videos(
                         query=query,
                         max_results=videos_per_query,
                         language='fa',
                         region_code='IR'
                     ):
-                        if len(videos) >= max_videos:
-                            break
-                        
+                        if yielded >= max_videos:
+                            return
+
                         if not self._should_process_video(video):
                             continue
-                        
-                        videos.append(video)
-                        self.stats['videos_found'] += 1
-                        
-                        # Store video metadata
-                        if self.db.insert_video(video):
-                            self.logger.debug(f"Stored video: {video['video_id']} - {video['title'][:50]}...")
-                        
-                        # Rate limiting
-                        time.sleep(self.config.RATE_LIMIT_DELAY)
+
+                        yielded += 1
+                        yield video
             else:
                 # Use automatic Farsi search
                 self.logger.info("Using automatic Farsi video search")
-                
+
                 for video in self.youtube_api.search_farsi_videos(max_results=max_videos):
-                    if len(videos) >= max_videos:
-                        break
-                    
+                    if yielded >= max_videos:
+                        return
+
                     if not self._should_process_video(video):
                         continue
-                    
-                    videos.append(video)
-                    self.stats['videos_found'] += 1
-                    
-                    # Store video metadata
-                    if self.db.insert_video(video):
-                        self.logger.debug(f"Stored video: {video['video_id']} - {video['title'][:50]}...")
-                    
-                    # Rate limiting
-                    time.sleep(self.config.RATE_LIMIT_DELAY)
-            
-            self.logger.info(f"Found {len(videos)} videos to process")
-            return videos
-            
+
+                    yielded += 1
+                    yield video
+
         except Exception as e:
             self.logger.error(f"Error during video search: {e}")
             raise
-    
+
+    async def _crawl_pipeline(self, max_videos: int, search_queries: List[str] = None,
+                              extract_subtitles: bool = True) -> List[Dict]:
+        """Overlap video search with subtitle extraction.
+
+        A bounded queue feeds search results straight into the extraction
+        consumers instead of collecting the whole list first, so wall time
+        approaches the longer of the two stages rather than their sum.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        videos: List[Dict] = []
+        pending_rows: List = []
+        num_consumers = self.config.MAX_CONCURRENT_DOWNLOADS if extract_subtitles else 0
+
+        async def produce():
+            flushed = 0
+            iterator = self._iter_search_results(max_videos, search_queries)
+            while True:
+                video = await asyncio.to_thread(next, iterator, None)
+                if video is None:
+                    break
+
+                videos.append(video)
+                self.stats['videos_found'] += 1
+
+                # Flush a full batch in one transaction
+                if len(videos) - flushed >= self.VIDEO_BATCH_SIZE:
+                    self._store_videos(videos[flushed:])
+                    flushed = len(videos)
+
+                if num_consumers:
+                    await queue.put(video)
+
+                # Rate limiting; asyncio.sleep yields to the consumers
+                # instead of stalling the whole event loop
+                await asyncio.sleep(self.config.RATE_LIMIT_DELAY)
+
+            # Store the remaining partial batch in one transaction
+            if len(videos) > flushed:
+                self._store_videos(videos[flushed:])
+            self.logger.debug(f"Stored {len(videos)} videos in database")
+
+            for _ in range(num_consumers):
+                await queue.put(None)
+
+        async def consume(pbar):
+            while True:
+                video = await queue.get()
+                if video is None:
+                    return
+                video_id = video['video_id']
+
+                try:
+                    result = await asyncio.to_thread(self._process_single_video, video)
+                except Exception as e:
+                    self.logger.error(f"Error processing video {video_id}: {e}")
+                    result = None
+
+                self._record_result(video_id, result, pending_rows)
+                pbar.update(1)
+
+        with tqdm(desc="Processing videos", unit="video") as pbar:
+            await asyncio.gather(produce(), *[consume(pbar) for _ in range(num_consumers)])
+
+        self._flush_subtitle_rows(pending_rows)
+
+        return videos
+
+    def _flush_subtitle_rows(self, pending_rows: List):
+        """Clean and insert a batch of pending subtitle rows.
+
+        Extraction hands over raw cue text, so the whole batch is cleaned
+        in one process-pool pass (batch_clean_subtitle_texts) instead of
+        per cue on each extraction thread, then inserted in one
+        transaction. Rows whose content cleans down to nothing are
+        dropped.
+        """
+        if not pending_rows:
+            return
+        cleaned = self.subtitle_extractor.batch_clean_subtitle_texts(
+            [(row[0], row[3]) for row in pending_rows])
+        rows = [
+            (video_id, language, sub_type, text, file_path)
+            for (video_id, language, sub_type, _, file_path), (_, text)
+            in zip(pending_rows, cleaned)
+            if text
+        ]
+        if rows:
+            self.db.insert_subtitles_bulk(rows)
+        del pending_rows[:]
+
+    def _record_result(self, video_id: str, result: Optional[Dict], pending_rows: List):
+        """Fold one extraction result into stats and the pending insert batch."""
+        if result:
+            self.stats['videos_processed'] += 1
+            if result.get('subtitles_extracted', 0) > 0:
+                self.stats['subtitles_extracted'] += result['subtitles_extracted']
+            pending_rows.extend(result.get('subtitle_rows', []))
+            if len(pending_rows) >= self.SUBTITLE_BATCH_SIZE:
+                self._flush_subtitle_rows(pending_rows)
+            self._video_status[video_id] = self.STATUS_PROCESSED
+        else:
+            self.stats['errors'] += 1
+            self._video_status[video_id] = self.STATUS_FAILED
+
     def _should_process_video(self, video: Dict) -> bool:
         """Determine if a video should be processed."""
         video_id = video['video_id']
-        
+        # Skip the f-string formatting entirely unless DEBUG is on; this
+        # runs once per search result
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
         # Skip if already processed in this session
-        if video_id in self.processed_videos:
+        if video_id in self._video_status:
             return False
-        
+
         # Skip if already exists in database (optional)
-        if self.db.video_exists(video_id):
+        if video_id in self._existing_ids:
             self.stats['skipped_existing'] += 1
-            self.logger.debug(f"Video {video_id} already exists in database")
+            if debug:
+                self.logger.debug(f"Video {video_id} already exists in database")
             return False
-        
+
         # Check duration constraints
         duration = video.get('duration', 0)
         if duration < self.config.MIN_VIDEO_DURATION or duration > self.config.MAX_VIDEO_DURATION:
-            self.logger.debug(f"Video {video_id} duration {duration}s outside constraints")
+            if debug:
+                self.logger.debug(f"Video {video_id} duration {duration}s outside constraints")
             return False
-        
+
         # Check channel whitelist if configured
         if self.config.CHANNEL_WHITELIST:
             channel_id = video.get('channel_id', '')
-            if channel_id not in self.config.CHANNEL_WHITELIST:
-                self.logger.debug(f"Video {video_id} channel not in whitelist")
+            if channel_id not in self.config.CHANNEL_WHITELIST_SET:
+                if debug:
+                    self.logger.debug(f"Video {video_id} channel not in whitelist")
                 return False
-        
+
         return True
     
     def _process_videos_with_subtitles(self, videos: List[Dict]):
         """Process videos and extract subtitles with concurrent processing."""
-        
-        with ThreadPoolExecutor(max_workers=self.config.MAX_CONCURRENT_DOWNLOADS) as executor:
-            # Submit all video processing tasks
-            future_to_video = {
-                executor.submit(self._process_single_video, video): video
-                for video in videos
-            }
-            
-            # Process completed tasks with progress bar
-            with tqdm(total=len(videos), desc="Processing videos") as pbar:
-                for future in as_completed(future_to_video):
-                    video = future_to_video[future]
-                    video_id = video['video_id']
-                    
-                    try:
-                        result = future.result()
-                        if result:
-                            self.stats['videos_processed'] += 1
-                            if result.get('subtitles_extracted', 0) > 0:
-                                self.stats['subtitles_extracted'] += result['subtitles_extracted']
-                        else:
-                            self.failed_videos.add(video_id)
-                            self.stats['errors'] += 1
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error processing video {video_id}: {e}")
-                        self.failed_videos.add(video_id)
-                        self.stats['errors'] += 1
-                    
-                    finally:
-                        self.processed_videos.add(video_id)
-                        pbar.update(1)
+        asyncio.run(self._process_videos_async(videos))
+
+    async def _process_videos_async(self, videos: List[Dict]):
+        """Fan subtitle extraction out over an asyncio semaphore.
+
+        yt-dlp is synchronous, so each in-flight video still runs on a
+        worker thread via asyncio.to_thread; the event loop owns scheduling,
+        the semaphore bounds concurrency, and results are consumed as they
+        complete without a thread blocked per pending future.
+        """
+        semaphore = asyncio.Semaphore(self.config.MAX_CONCURRENT_DOWNLOADS)
+
+        async def process(video: Dict):
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(self._process_single_video, video)
+                except Exception as e:
+                    self.logger.error(f"Error processing video {video['video_id']}: {e}")
+                    result = None
+                return video, result
+
+        tasks = [asyncio.ensure_future(process(video)) for video in videos]
+
+        # Consume completions with a progress bar, draining subtitle rows
+        # into batched inserts so many videos share one transaction
+        pending_rows = []
+        with tqdm(total=len(videos), desc="Processing videos") as pbar:
+            for task in asyncio.as_completed(tasks):
+                video, result = await task
+                self._record_result(video['video_id'], result, pending_rows)
+                pbar.update(1)
+
+        self._flush_subtitle_rows(pending_rows)
     
     def _process_single_video(self, video: Dict) -> Optional[Dict]:
         """Process a single video and extract its subtitles."""
@@ -234,60 +385,71 @@ class FarsiVideoCrawler:
         try:
             self.logger.debug(f"Processing video: {video_id}")
             
-            # Extract subtitles
-            subtitles_info = self.subtitle_extractor.extract_subtitles(video_id)
+            # Extract subtitles; cleaning is deferred so _flush_subtitle_rows
+            # can run it for many videos in one process-pool batch
+            subtitles_info = self.subtitle_extractor.extract_subtitles(
+                video_id, clean=False)
             
             if not subtitles_info:
                 self.logger.warning(f"No subtitles found for video {video_id}")
                 return {'subtitles_extracted': 0}
             
-            # Store subtitles in database
-            subtitles_stored = 0
-            for subtitle_key, subtitle_data in subtitles_info.items():
-                language = subtitle_data['language']
-                subtitle_type = subtitle_data['type']
-                content = subtitle_data['content']
-                file_path = subtitle_data.get('file_path')
-                
-                if content and len(content.strip()) > 0:
-                    if self.db.insert_subtitle(video_id, language, subtitle_type, content, file_path):
-                        subtitles_stored += 1
-                        self.logger.debug(f"Stored {language} {subtitle_type} subtitle for {video_id}")
-            
-            return {'subtitles_extracted': subtitles_stored}
+            # Collect subtitle rows; the caller batches them across videos so
+            # many extractions share one insert transaction
+            subtitle_rows = [
+                (video_id, subtitle_data['language'], subtitle_data['type'],
+                 subtitle_data['content'], subtitle_data.get('file_path'))
+                for subtitle_data in subtitles_info.values()
+                if subtitle_data['content'] and len(subtitle_data['content'].strip()) > 0
+            ]
+
+            return {'subtitles_extracted': len(subtitle_rows),
+                    'subtitle_rows': subtitle_rows}
             
         except Exception as e:
             self.logger.error(f"Error processing video {video_id}: {e}")
             return None
     
+    def _fetch_channel_videos(self, channel_id: str, max_videos: int) -> List[Dict]:
+        """Materialize one channel's video listing (runs on a worker thread)."""
+        return list(self.youtube_api.get_channel_videos(channel_id, max_videos))
+
     def crawl_specific_channels(self, channel_ids: List[str], max_videos_per_channel: int = 50) -> Dict:
         """Crawl videos from specific YouTube channels."""
         self.logger.info(f"Crawling {len(channel_ids)} specific channels")
-        
+
+        if not channel_ids:
+            return self.stats
+
         all_videos = []
-        
-        for channel_id in channel_ids:
-            self.logger.info(f"Crawling channel: {channel_id}")
-            
-            try:
-                channel_videos = list(self.youtube_api.get_channel_videos(
-                    channel_id, max_videos_per_channel
-                ))
-                
-                for video in channel_videos:
-                    if self._should_process_video(video):
-                        all_videos.append(video)
-                        self.stats['videos_found'] += 1
-                        
-                        # Store video metadata
-                        self.db.insert_video(video)
-                
+
+        # Fetch channel listings in parallel: wall time is roughly the
+        # slowest channel instead of the sum of every round-trip
+        with ThreadPoolExecutor(max_workers=min(16, len(channel_ids))) as executor:
+            future_to_channel = {
+                executor.submit(self._fetch_channel_videos, channel_id, max_videos_per_channel): channel_id
+                for channel_id in channel_ids
+            }
+
+            for future in as_completed(future_to_channel):
+                channel_id = future_to_channel[future]
+
+                try:
+                    channel_videos = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error crawling channel {channel_id}: {e}")
+                    continue
+
+                new_videos = [video for video in channel_videos
+                              if self._should_process_video(video)]
+                all_videos.extend(new_videos)
+                self.stats['videos_found'] += len(new_videos)
+
+                # Store channel's video metadata in one transaction
+                self._store_videos(new_videos)
+
                 self.logger.info(f"Found {len(channel_videos)} videos from channel {channel_id}")
-                
-            except Exception as e:
-                self.logger.error(f"Error crawling channel {channel_id}: {e}")
-                continue
-        
+
         # Process videos with subtitles
         if all_videos:
             self._process_videos_with_subtitles(all_videos)
@@ -298,12 +460,8 @@ class FarsiVideoCrawler:
         """Resume subtitle extraction for videos without subtitles."""
         self.logger.info("Resuming subtitle extraction for existing videos")
         
-        # Get videos without Farsi subtitles
-        videos_without_farsi = self.db.get_videos_without_subtitles('fa')
-        videos_without_english = self.db.get_videos_without_subtitles('en')
-        
-        # Combine and deduplicate
-        videos_to_process = list(set(videos_without_farsi + videos_without_english))
+        # One query; UNION deduplicates the fa/en branches in SQL
+        videos_to_process = self.db.get_videos_missing_any_subtitles(['fa', 'en'])
         
         if max_videos:
             videos_to_process = videos_to_process[:max_videos]
@@ -330,6 +488,6 @@ class FarsiVideoCrawler:
             **db_stats,
             'session_id': self.session_id,
             'youtube_api_quota_used': self.youtube_api.get_quota_usage(),
-            'processed_videos_count': len(self.processed_videos),
+            'processed_videos_count': len(self._video_status),
             'failed_videos_count': len(self.failed_videos)
         }
\ No newline at end of file
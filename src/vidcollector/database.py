@@ -1,55 +1,314 @@
 """Database management for VidCollector."""
 
 import sqlite3
+import zlib
 import json
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+# orjson's C encoder is several times faster than stdlib json for the
+# per-row tags serialization; fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_EMPTY_TAGS = '[]'
+
+def _dump_json(obj) -> str:
+    """Serialize to JSON text with orjson's C encoder when available.
+
+    Decoded back to str so TEXT columns keep TEXT storage (bytes binds
+    would be stored as BLOBs); orjson plus the decode still comfortably
+    beats stdlib json.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+def _dump_tags(tags) -> str:
+    """Serialize a tags list, reusing a constant for the empty case."""
+    return _dump_json(tags) if tags else _EMPTY_TAGS
+
+# Hot-path SQL hoisted to module scope: each string is built and interned
+# once, and the per-thread connections' statement cache (keyed on the exact
+# string) reuses the prepared statement across calls.
+_SQL_INSERT_VIDEO = '''
+    INSERT OR REPLACE INTO videos (
+        video_id, title, description, channel_id, channel_title,
+        duration, view_count, like_count, published_at, language,
+        tags, thumbnail_url
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_SUBTITLE = '''
+    INSERT OR REPLACE INTO subtitles (
+        video_id, language, subtitle_type, content, file_path
+    ) VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_VIDEO_EXISTS = 'SELECT 1 FROM videos WHERE video_id = ?'
+
+# Subtitle text above this size is zlib-compressed before storage; hour-long
+# auto-captions run to multiple megabytes and compress 5-10x, which shrinks
+# both the database file and the bytes each transaction must fsync.
+_CONTENT_COMPRESS_THRESHOLD = 16384
+
+
+def _pack_content(content: str):
+    """Compress large subtitle text for storage; small text stays as-is."""
+    if content and len(content) >= _CONTENT_COMPRESS_THRESHOLD:
+        return zlib.compress(content.encode('utf-8'), 1)
+    return content
+
+
+def unpack_content(value) -> str:
+    """Reverse _pack_content for rows read back from the subtitles table."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+# Crawl-session updates touch at most these five columns, so every possible
+# UPDATE statement is enumerated up front (31 subsets) and looked up by the
+# set of columns being written — no per-call string building or validation.
+_CRAWL_SESSION_FIELDS = ('videos_found', 'videos_processed',
+                         'subtitles_extracted', 'status', 'completed_at')
+_CRAWL_SESSION_FIELD_SET = frozenset(_CRAWL_SESSION_FIELDS)
+
+def _build_session_update_templates() -> Dict[frozenset, Tuple[Tuple[str, ...], str]]:
+    from itertools import combinations
+    templates = {}
+    for r in range(1, len(_CRAWL_SESSION_FIELDS) + 1):
+        for columns in combinations(_CRAWL_SESSION_FIELDS, r):
+            set_clause = ', '.join(f'{column} = ?' for column in columns)
+            templates[frozenset(columns)] = (
+                columns,
+                f'UPDATE crawl_sessions SET {set_clause} WHERE session_id = ?'
+            )
+    return templates
+
+_SQL_SESSION_UPDATES = _build_session_update_templates()
+
 class DatabaseManager:
     """Manages SQLite database for storing video metadata and subtitles."""
     
+    # Connection string used when the manager is opened on ':memory:'.
+    # Shared cache makes every per-thread connection see the same in-memory
+    # database instead of a private empty one; the database lives until the
+    # last connection closes. Note the shared cache is process-wide, so two
+    # in-memory managers in one process would see the same database — fine
+    # for tests, which hold exactly one at a time.
+    _MEMORY_URI = 'file::memory:?cache=shared'
+
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self._ensure_db_directory()
+        self._in_memory = db_path == ':memory:'
+        # Explicit 'file:' URIs (e.g. 'file:testdb?mode=memory&cache=shared'
+        # for cross-manager tests) are passed through with uri=True
+        self._is_uri = db_path.startswith('file:')
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        if not self._in_memory and not self._is_uri:
+            self._ensure_db_directory()
         self._init_database()
-    
+        # Warm the language-code translation cache from the dimension table
+        self._lang_ids: Dict[str, int] = {
+            code: lang_id for lang_id, code in
+            self._conn().execute('SELECT id, code FROM languages')
+        }
+
     def _ensure_db_directory(self):
         """Ensure the database directory exists."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with performance PRAGMAs applied.
+
+        WAL avoids the per-transaction fsync of the main database file,
+        synchronous=NORMAL is safe under WAL, and the larger cache/mmap
+        settings cut read syscalls on bigger databases.
+        """
+        # A larger statement cache lets sqlite3 reuse prepared statements for
+        # the repeated INSERT/SELECT strings issued by the crawl loops instead
+        # of re-parsing the SQL each call.
+        # isolation_level=None puts the connection in autocommit mode:
+        # sqlite3 stops wrapping every execute in an implicit BEGIN, and
+        # the bulk paths open explicit transactions where batching pays.
+        if self._in_memory:
+            conn = sqlite3.connect(self._MEMORY_URI, uri=True,
+                                   cached_statements=256, isolation_level=None)
+        else:
+            conn = sqlite3.connect(self.db_path, uri=self._is_uri,
+                                   cached_statements=256, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MB
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's persistent connection, creating it lazily.
+
+        Opening a connection per call meant re-running the PRAGMAs and
+        throwing away the page and statement caches on every operation.
+        Each thread instead keeps one connection for the lifetime of the
+        manager; sqlite3 connections are not thread-safe, so they are
+        never shared across threads.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close all per-thread connections.
+
+        Closing checkpoints the WAL and removes the -wal/-shm side files,
+        so call this before deleting or moving the database file.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+    def _rollback(self):
+        """Roll back this thread's open transaction, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            try:
+                conn.execute('ROLLBACK')
+            except Exception:
+                pass
+
     def _init_database(self):
         """Initialize database tables."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Videos table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS videos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    video_id TEXT UNIQUE NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    channel_id TEXT,
-                    channel_title TEXT,
-                    duration INTEGER,
-                    view_count INTEGER,
-                    like_count INTEGER,
-                    published_at TEXT,
-                    language TEXT,
-                    tags TEXT,
-                    thumbnail_url TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+        conn = self._conn()
+        cursor = conn.cursor()
+
+        # Videos table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS videos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_id TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                channel_id TEXT,
+                channel_title TEXT,
+                duration INTEGER,
+                view_count INTEGER,
+                like_count INTEGER,
+                published_at TEXT,
+                language TEXT,
+                tags TEXT,
+                thumbnail_url TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Language dimension: subtitles store a one-byte integer id instead
+        # of a TEXT code, so index entries are smaller and comparisons are
+        # collation-free. Codes are translated via _lang_id at the API
+        # boundary; callers keep passing 'fa'/'en'.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS languages (
+                id INTEGER PRIMARY KEY,
+                code TEXT UNIQUE NOT NULL
+            )
+        ''')
+        cursor.executemany('INSERT OR IGNORE INTO languages (code) VALUES (?)',
+                           [('fa',), ('en',)])
+
+        # Subtitles table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS subtitles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_id TEXT NOT NULL,
+                language INTEGER NOT NULL REFERENCES languages (id),
+                subtitle_type TEXT NOT NULL,  -- 'auto' or 'manual'
+                content TEXT NOT NULL,
+                file_path TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (video_id) REFERENCES videos (video_id),
+                UNIQUE(video_id, language, subtitle_type)
+            )
+        ''')
+        self._migrate_text_language_column(conn)
+
+        # Composite index so the videos-without-subtitles anti-join can
+        # probe by language instead of scanning the subtitles table
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_subtitles_language_video
+            ON subtitles (language, video_id)
+        ''')
+
+        # Channel lookups (whitelist filtering, per-channel stats)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_videos_channel
+            ON videos (channel_id)
+        ''')
+
+        # Bump updated_at inside the engine so inserts don't need a Python
+        # timestamp per row (recursive triggers are off by default, so the
+        # trigger's own UPDATE does not re-fire it)
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_videos_updated
+            AFTER UPDATE ON videos
+            BEGIN
+                UPDATE videos SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+            END
+        ''')
+
+        # Crawl sessions table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT UNIQUE NOT NULL,
+                search_query TEXT,
+                videos_found INTEGER DEFAULT 0,
+                videos_processed INTEGER DEFAULT 0,
+                subtitles_extracted INTEGER DEFAULT 0,
+                started_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                completed_at TEXT,
+                status TEXT DEFAULT 'running'
+            )
+        ''')
+
+    def _migrate_text_language_column(self, conn: sqlite3.Connection):
+        """Rebuild pre-dimension subtitles tables that stored language as TEXT.
+
+        CREATE TABLE IF NOT EXISTS leaves older databases on the legacy
+        schema, so detect the TEXT-typed column and rewrite the table once,
+        mapping codes through the languages dimension. The old composite
+        index is dropped with the table and recreated by schema init.
+        """
+        columns = conn.execute('PRAGMA table_info(subtitles)').fetchall()
+        lang_type = next((col[2] for col in columns if col[1] == 'language'), '')
+        if lang_type.upper() != 'TEXT':
+            return
+
+        conn.execute('BEGIN')
+        try:
+            conn.execute('''
+                INSERT OR IGNORE INTO languages (code)
+                SELECT DISTINCT language FROM subtitles
             ''')
-            
-            # Subtitles table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS subtitles (
+            conn.execute('''
+                CREATE TABLE subtitles_migrated (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     video_id TEXT NOT NULL,
-                    language TEXT NOT NULL,
+                    language INTEGER NOT NULL REFERENCES languages (id),
                     subtitle_type TEXT NOT NULL,  -- 'auto' or 'manual'
                     content TEXT NOT NULL,
                     file_path TEXT,
@@ -58,129 +317,272 @@ class DatabaseManager:
                     UNIQUE(video_id, language, subtitle_type)
                 )
             ''')
-            
-            # Crawl sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS crawl_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT UNIQUE NOT NULL,
-                    search_query TEXT,
-                    videos_found INTEGER DEFAULT 0,
-                    videos_processed INTEGER DEFAULT 0,
-                    subtitles_extracted INTEGER DEFAULT 0,
-                    started_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TEXT,
-                    status TEXT DEFAULT 'running'
-                )
+            conn.execute('''
+                INSERT INTO subtitles_migrated
+                    (id, video_id, language, subtitle_type, content,
+                     file_path, created_at)
+                SELECT s.id, s.video_id, l.id, s.subtitle_type, s.content,
+                       s.file_path, s.created_at
+                FROM subtitles s JOIN languages l ON l.code = s.language
             ''')
-            
-            conn.commit()
-    
+            conn.execute('DROP TABLE subtitles')
+            conn.execute('ALTER TABLE subtitles_migrated RENAME TO subtitles')
+            conn.execute('COMMIT')
+        except Exception:
+            self._rollback()
+            raise
+
+    def _lang_id(self, code: str) -> int:
+        """Translate a language code to its dimension id, adding new codes."""
+        lang_id = self._lang_ids.get(code)
+        if lang_id is None:
+            conn = self._conn()
+            conn.execute('INSERT OR IGNORE INTO languages (code) VALUES (?)',
+                         (code,))
+            lang_id = conn.execute('SELECT id FROM languages WHERE code = ?',
+                                   (code,)).fetchone()[0]
+            self._lang_ids[code] = lang_id
+        return lang_id
+
     def insert_video(self, video_data: Dict) -> bool:
         """Insert or update video metadata."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO videos (
-                        video_id, title, description, channel_id, channel_title,
-                        duration, view_count, like_count, published_at, language,
-                        tags, thumbnail_url, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video_data['video_id'],
-                    video_data['title'],
-                    video_data.get('description', ''),
-                    video_data.get('channel_id', ''),
-                    video_data.get('channel_title', ''),
-                    video_data.get('duration', 0),
-                    video_data.get('view_count', 0),
-                    video_data.get('like_count', 0),
-                    video_data.get('published_at', ''),
-                    video_data.get('language', ''),
-                    json.dumps(video_data.get('tags', [])),
-                    video_data.get('thumbnail_url', ''),
-                    datetime.now().isoformat()
-                ))
-                
-                conn.commit()
-                return True
+            conn = self._conn()
+
+            # updated_at is omitted so the DEFAULT CURRENT_TIMESTAMP fires;
+            # SQLite stamps the row in C instead of formatting a Python
+            # datetime per insert
+            conn.execute(_SQL_INSERT_VIDEO, (
+                video_data['video_id'],
+                video_data['title'],
+                video_data.get('description', ''),
+                video_data.get('channel_id', ''),
+                video_data.get('channel_title', ''),
+                video_data.get('duration', 0),
+                video_data.get('view_count', 0),
+                video_data.get('like_count', 0),
+                video_data.get('published_at', ''),
+                video_data.get('language', ''),
+                _dump_tags(video_data.get('tags')),
+                video_data.get('thumbnail_url', '')
+            ))
+            return True
         except Exception as e:
             print(f"Error inserting video {video_data.get('video_id', 'unknown')}: {e}")
             return False
     
-    def insert_subtitle(self, video_id: str, language: str, subtitle_type: str, 
+    def insert_videos_bulk(self, videos: List[Dict]) -> int:
+        """Insert or update a batch of videos in a single transaction.
+
+        Much faster than calling insert_video per row: one SQL parse and one
+        commit for the whole batch instead of one per video.
+        """
+        if not videos:
+            return 0
+
+        try:
+            rows = [(
+                video['video_id'],
+                video['title'],
+                video.get('description', ''),
+                video.get('channel_id', ''),
+                video.get('channel_title', ''),
+                video.get('duration', 0),
+                video.get('view_count', 0),
+                video.get('like_count', 0),
+                video.get('published_at', ''),
+                video.get('language', ''),
+                _dump_tags(video.get('tags')),
+                video.get('thumbnail_url', '')
+            ) for video in videos]
+
+            conn = self._conn()
+            conn.execute('BEGIN')
+            conn.executemany(_SQL_INSERT_VIDEO, rows)
+            conn.execute('COMMIT')
+            return len(rows)
+        except Exception as e:
+            self._rollback()
+            print(f"Error bulk inserting videos: {e}")
+            return 0
+
+    def insert_videos_json(self, videos: List[Dict]) -> int:
+        """Insert a batch of videos by expanding one JSON document in SQLite.
+
+        Serializes the whole batch once and lets json_each() unpack it inside
+        the engine, so there is a single SQL statement and no per-row tuple
+        packing on the Python side. Useful for very large batches where the
+        executemany round-trips start to show up.
+        """
+        if not videos:
+            return 0
+
+        try:
+            conn = self._conn()
+            cursor = conn.execute('''
+                INSERT OR REPLACE INTO videos (
+                    video_id, title, description, channel_id, channel_title,
+                    duration, view_count, like_count, published_at, language,
+                    tags, thumbnail_url
+                )
+                SELECT
+                    json_extract(value, '$.video_id'),
+                    json_extract(value, '$.title'),
+                    coalesce(json_extract(value, '$.description'), ''),
+                    coalesce(json_extract(value, '$.channel_id'), ''),
+                    coalesce(json_extract(value, '$.channel_title'), ''),
+                    coalesce(json_extract(value, '$.duration'), 0),
+                    coalesce(json_extract(value, '$.view_count'), 0),
+                    coalesce(json_extract(value, '$.like_count'), 0),
+                    coalesce(json_extract(value, '$.published_at'), ''),
+                    coalesce(json_extract(value, '$.language'), ''),
+                    coalesce(json_extract(value, '$.tags'), '[]'),
+                    coalesce(json_extract(value, '$.thumbnail_url'), '')
+                FROM json_each(?)
+            ''', (_dump_json(videos),))
+            return cursor.rowcount
+        except Exception as e:
+            print(f"Error bulk inserting videos via json_each: {e}")
+            return 0
+
+    def insert_subtitles_bulk(self, subtitles: List[Tuple[str, str, str, str, Optional[str]]]) -> int:
+        """Insert a batch of subtitles in a single transaction.
+
+        Each entry is a (video_id, language, subtitle_type, content, file_path)
+        tuple.
+        """
+        if not subtitles:
+            return 0
+
+        try:
+            rows = [
+                (video_id, self._lang_id(language), subtitle_type, content,
+                 file_path)
+                for video_id, language, subtitle_type, content, file_path
+                in subtitles
+            ]
+            conn = self._conn()
+            conn.execute('BEGIN')
+            conn.executemany(_SQL_INSERT_SUBTITLE, rows)
+            conn.execute('COMMIT')
+            return len(subtitles)
+        except Exception as e:
+            self._rollback()
+            print(f"Error bulk inserting subtitles: {e}")
+            return 0
+
+    def insert_subtitle(self, video_id: str, language: str, subtitle_type: str,
                        content: str, file_path: Optional[str] = None) -> bool:
         """Insert subtitle data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO subtitles (
-                        video_id, language, subtitle_type, content, file_path
-                    ) VALUES (?, ?, ?, ?, ?)
-                ''', (video_id, language, subtitle_type, content, file_path))
-                
-                conn.commit()
-                return True
+            conn = self._conn()
+            conn.execute(_SQL_INSERT_SUBTITLE,
+                         (video_id, self._lang_id(language), subtitle_type,
+                          content, file_path))
+            return True
         except Exception as e:
             print(f"Error inserting subtitle for {video_id}: {e}")
             return False
     
+    def load_existing_video_ids(self) -> Set[str]:
+        """Load every stored video_id into a set for O(1) membership tests.
+
+        One full-table scan up front replaces a SELECT per candidate video
+        on the crawl hot path.
+        """
+        conn = self._conn()
+        cursor = conn.execute('SELECT video_id FROM videos')
+        return {row[0] for row in cursor}
+
     def video_exists(self, video_id: str) -> bool:
         """Check if video already exists in database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT 1 FROM videos WHERE video_id = ?', (video_id,))
-            return cursor.fetchone() is not None
-    
+        conn = self._conn()
+        cursor = conn.execute(_SQL_VIDEO_EXISTS, (video_id,))
+        return cursor.fetchone() is not None
+
+    def get_counts(self) -> Dict[str, int]:
+        """Get video and subtitle row counts in one statement.
+
+        Both COUNT(*) scans run as scalar subqueries of a single SELECT,
+        halving the statement overhead for callers that report both.
+        """
+        conn = self._conn()
+        videos, subtitles = conn.execute(
+            'SELECT (SELECT COUNT(*) FROM videos),'
+            ' (SELECT COUNT(*) FROM subtitles)').fetchone()
+        return {'videos': videos, 'subtitles': subtitles}
+
     def get_video_count(self) -> int:
         """Get total number of videos in database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM videos')
-            return cursor.fetchone()[0]
-    
+        conn = self._conn()
+        return conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+
     def get_subtitle_count(self) -> int:
         """Get total number of subtitles in database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM subtitles')
-            return cursor.fetchone()[0]
-    
-    def get_videos_without_subtitles(self, language: str = None) -> List[str]:
-        """Get video IDs that don't have subtitles for specified language."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if language:
-                cursor.execute('''
-                    SELECT v.video_id FROM videos v
-                    LEFT JOIN subtitles s ON v.video_id = s.video_id AND s.language = ?
-                    WHERE s.video_id IS NULL
-                ''', (language,))
-            else:
-                cursor.execute('''
-                    SELECT v.video_id FROM videos v
-                    LEFT JOIN subtitles s ON v.video_id = s.video_id
-                    WHERE s.video_id IS NULL
-                ''')
-            
-            return [row[0] for row in cursor.fetchall()]
-    
+        conn = self._conn()
+        return conn.execute('SELECT COUNT(*) FROM subtitles').fetchone()[0]
+
+    def get_videos_without_subtitles(self, language: str = None) -> Set[str]:
+        """Get video IDs that don't have subtitles for specified language.
+
+        Returned as a set so callers doing membership checks pay O(1)
+        per lookup instead of scanning a list.
+        """
+        conn = self._conn()
+
+        # NOT EXISTS lets SQLite probe the subtitles unique index per video
+        # row instead of materializing the left join
+        if language:
+            cursor = conn.execute('''
+                SELECT v.video_id FROM videos v
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM subtitles s
+                    WHERE s.video_id = v.video_id AND s.language = ?
+                )
+            ''', (self._lang_id(language),))
+        else:
+            cursor = conn.execute('''
+                SELECT v.video_id FROM videos v
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM subtitles s WHERE s.video_id = v.video_id
+                )
+            ''')
+
+        return {row[0] for row in cursor.fetchall()}
+
+    def get_videos_missing_any_subtitles(self, languages: List[str]) -> List[str]:
+        """Get video IDs missing subtitles in at least one of the languages.
+
+        One scan of the videos table with OR'd NOT EXISTS probes: each
+        video appears at most once with no sort-based dedup, and results
+        come back in insertion order, which keeps the per-video lookups
+        that follow walking the page cache sequentially.
+        """
+        if not languages:
+            return []
+
+        conn = self._conn()
+        probe = '''NOT EXISTS (
+                SELECT 1 FROM subtitles s
+                WHERE s.video_id = v.video_id AND s.language = ?
+            )'''
+        query = (
+            'SELECT v.video_id FROM videos v WHERE '
+            + ' OR '.join([probe] * len(languages))
+            + ' ORDER BY v.id'
+        )
+        cursor = conn.execute(query, [self._lang_id(lang) for lang in languages])
+        return [row[0] for row in cursor.fetchall()]
+
     def start_crawl_session(self, session_id: str, search_query: str) -> bool:
         """Start a new crawl session."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO crawl_sessions (session_id, search_query)
-                    VALUES (?, ?)
-                ''', (session_id, search_query))
-                conn.commit()
-                return True
+            conn = self._conn()
+            conn.execute('''
+                INSERT INTO crawl_sessions (session_id, search_query)
+                VALUES (?, ?)
+            ''', (session_id, search_query))
+            return True
         except Exception as e:
             print(f"Error starting crawl session: {e}")
             return False
@@ -188,28 +590,19 @@ class DatabaseManager:
     def update_crawl_session(self, session_id: str, **kwargs) -> bool:
         """Update crawl session statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                set_clauses = []
-                values = []
-                
-                for key, value in kwargs.items():
-                    if key in ['videos_found', 'videos_processed', 'subtitles_extracted', 'status']:
-                        set_clauses.append(f"{key} = ?")
-                        values.append(value)
-                
-                if 'status' in kwargs and kwargs['status'] == 'completed':
-                    set_clauses.append("completed_at = ?")
-                    values.append(datetime.now().isoformat())
-                
-                if set_clauses:
-                    query = f"UPDATE crawl_sessions SET {', '.join(set_clauses)} WHERE session_id = ?"
-                    values.append(session_id)
-                    cursor.execute(query, values)
-                    conn.commit()
-                
-                return True
+            updates = {key: value for key, value in kwargs.items()
+                       if key in _CRAWL_SESSION_FIELD_SET}
+            if kwargs.get('status') == 'completed':
+                updates['completed_at'] = datetime.now().isoformat()
+
+            if updates:
+                columns, query = _SQL_SESSION_UPDATES[frozenset(updates)]
+                values = [updates[column] for column in columns]
+                values.append(session_id)
+                conn = self._conn()
+                conn.execute(query, values)
+
+            return True
         except Exception as e:
             print(f"Error updating crawl session: {e}")
             return False
@@ -223,80 +616,153 @@ class VideoDatabase:
         self.db_path = db_path
         self.db_manager = DatabaseManager(db_path)
     
+    def begin(self):
+        """Open an explicit transaction on this thread's connection."""
+        conn = self.db_manager._conn()
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+    
+    def commit(self):
+        """Commit the open transaction, if any."""
+        conn = self.db_manager._conn()
+        if conn.in_transaction:
+            conn.execute('COMMIT')
+    
+    def rollback(self):
+        """Roll back the open transaction, if any."""
+        self.db_manager._rollback()
+    
     def video_exists(self, video_id: str) -> bool:
         """Check if video exists in database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,))
-                return cursor.fetchone() is not None
+            cursor = self.db_manager._conn().execute(
+                "SELECT 1 FROM videos WHERE video_id = ?", (video_id,))
+            return cursor.fetchone() is not None
         except Exception:
             return False
     
+    def existing_video_ids(self, video_ids: List[str]) -> Set[str]:
+        """Return the subset of video_ids already stored.
+
+        One chunked IN query instead of a SELECT per candidate, so
+        callers can pre-filter a whole batch before processing it.
+        """
+        existing: Set[str] = set()
+        if not video_ids:
+            return existing
+        try:
+            conn = self.db_manager._conn()
+            # Stay under SQLite's default 999-parameter limit
+            for start in range(0, len(video_ids), 900):
+                chunk = video_ids[start:start + 900]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT video_id FROM videos WHERE video_id IN ({placeholders})",
+                    chunk)
+                existing.update(row[0] for row in cursor)
+        except Exception as e:
+            print(f"Error checking existing videos: {e}")
+        return existing
+    
     def insert_video(self, video_id: str, title: str, description: str = '', 
                     channel_title: str = '', published_at: str = '', duration: str = '',
                     view_count: int = 0, like_count: int = 0, language: str = 'fa',
                     url: str = '', farsi_score: float = 0.0) -> bool:
         """Insert video metadata."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO videos 
-                    (video_id, title, description, channel_title, published_at, 
-                     duration, view_count, like_count, language, tags, thumbnail_url)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (video_id, title, description, channel_title, published_at,
-                      duration, view_count, like_count, language, 
-                      json.dumps({'url': url, 'farsi_score': farsi_score}), ''))
-                conn.commit()
-                return True
+            self.db_manager._conn().execute('''
+                INSERT OR REPLACE INTO videos 
+                (video_id, title, description, channel_title, published_at, 
+                 duration, view_count, like_count, language, tags, thumbnail_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (video_id, title, description, channel_title, published_at,
+                  duration, view_count, like_count, language, 
+                  _dump_json({'url': url, 'farsi_score': farsi_score}), ''))
+            return True
         except Exception as e:
             print(f"Error inserting video: {e}")
             return False
     
     def insert_subtitle(self, video_id: str, language: str, content: str,
                        format_type: str = 'srt', source: str = 'downsub.com',
-                       file_path: str = '') -> bool:
-        """Insert subtitle data."""
+                       file_path: str = '', word_count: Optional[int] = None) -> bool:
+        """Insert subtitle data.
+
+        Callers that already tokenized the content can pass word_count to
+        skip recounting it here.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO subtitles 
-                    (video_id, language, content, format, source, file_path, word_count, char_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (video_id, language, content, format_type, source, file_path,
-                      len(content.split()), len(content)))
-                conn.commit()
-                return True
+            if word_count is None:
+                # Count separators instead of content.split(): no list of
+                # every token allocated just to take its length
+                word_count = content.count(' ') + 1 if content else 0
+
+            self.db_manager._conn().execute('''
+                INSERT OR REPLACE INTO subtitles
+                (video_id, language, content, format, source, file_path, word_count, char_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (video_id, language, content, format_type, source, file_path,
+                  word_count, len(content)))
+            return True
         except Exception as e:
             print(f"Error inserting subtitle: {e}")
             return False
     
+    def insert_subtitles_many(self, rows: List[Tuple[str, str, str, str, str]]) -> int:
+        """Insert subtitle rows with one prepared statement.
+
+        Each row is a (video_id, language, subtitle_type, content, file_path)
+        tuple matching the schema. The statement is parsed once and rebound
+        per row, and the call joins any transaction already open on this
+        thread's connection.
+        """
+        if not rows:
+            return 0
+        try:
+            packed = [
+                (video_id, self.db_manager._lang_id(language), subtitle_type,
+                 _pack_content(content), file_path)
+                for video_id, language, subtitle_type, content, file_path in rows
+            ]
+            self.db_manager._conn().executemany(_SQL_INSERT_SUBTITLE, packed)
+            return len(rows)
+        except Exception as e:
+            print(f"Error inserting subtitles: {e}")
+            return 0
+    
+    def get_subtitle_content(self, video_id: str, language: str) -> Optional[str]:
+        """Fetch one subtitle's text, transparently decompressing it."""
+        try:
+            row = self.db_manager._conn().execute(
+                "SELECT content FROM subtitles WHERE video_id = ? AND language = ?",
+                (video_id, self.db_manager._lang_id(language))).fetchone()
+            return unpack_content(row[0]) if row else None
+        except Exception as e:
+            print(f"Error reading subtitle content: {e}")
+            return None
+    
     def get_stats(self) -> Dict:
         """Get database statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Video count
-                cursor.execute("SELECT COUNT(*) FROM videos")
-                video_count = cursor.fetchone()[0]
-                
-                # Subtitle count
-                cursor.execute("SELECT COUNT(*) FROM subtitles")
-                subtitle_count = cursor.fetchone()[0]
-                
-                # Farsi subtitle count
-                cursor.execute("SELECT COUNT(*) FROM subtitles WHERE language = 'fa'")
-                farsi_subtitle_count = cursor.fetchone()[0]
-                
-                # English subtitle count
-                cursor.execute("SELECT COUNT(*) FROM subtitles WHERE language = 'en'")
-                english_subtitle_count = cursor.fetchone()[0]
-                
-                return {
+            conn = self.db_manager._conn()
+            
+            # Video count
+            video_count = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            
+            # Subtitle count
+            subtitle_count = conn.execute("SELECT COUNT(*) FROM subtitles").fetchone()[0]
+            
+            # Farsi subtitle count
+            farsi_subtitle_count = conn.execute(
+                "SELECT COUNT(*) FROM subtitles WHERE language = ?",
+                (self.db_manager._lang_id('fa'),)).fetchone()[0]
+
+            # English subtitle count
+            english_subtitle_count = conn.execute(
+                "SELECT COUNT(*) FROM subtitles WHERE language = ?",
+                (self.db_manager._lang_id('en'),)).fetchone()[0]
+            
+            return {
                     'videos': video_count,
                     'subtitles': subtitle_count,
                     'farsi_subtitles': farsi_subtitle_count,
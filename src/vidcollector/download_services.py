@@ -4,21 +4,136 @@ Integration with external download services (ytdown.to and downsub.com).
 
 import os
 import re
-import time
+import json
 import logging
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from fake_useragent import UserAgent
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .file_writer import BackgroundFileWriter
+
 logger = logging.getLogger(__name__)
 
+def _iter_anchors(content: bytes):
+    """Yield (href, text) for each anchor with an href in an HTML page.
+
+    The pull parser only surfaces <a> end events, so everything else on
+    the page — script blocks, styling, layout markup — is skipped at the
+    C level instead of being walked from Python. The HTML parser's
+    default recovery keeps malformed markup from aborting the scan.
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='a')
+    parser.feed(content)
+    parser.close()
+    for _, element in parser.read_events():
+        href = element.get('href')
+        if href:
+            yield href, ''.join(element.itertext()).strip()
+        element.clear()
+
+# Compiled once: these run per anchor inside the link-scanning loops, and
+# per URL in the download paths, so skip the re-cache lookup on each call
+_RE_QUALITY = re.compile(r'(\d+p)')
+_RE_VIDEO_ID = re.compile(r'(?:v=|/)([a-zA-Z0-9_-]{11})')
+
+# Longest names first so 'farsi' is matched before its 'fa' substring;
+# a few substring tests beat a regex search per anchor
+_LANG_MAP = (
+    ('farsi', 'fa'),
+    ('persian', 'fa'),
+    ('english', 'en'),
+    ('fa', 'fa'),
+    ('en', 'en'),
+)
+
+# Once these are all collected the remaining anchors can't improve the
+# result, so the page scans stop early
+_TARGET_QUALITIES = frozenset(['720p', '480p', '360p'])
+_TARGET_LANGUAGES = ('fa', 'en')
+
+
+def _classify_download_anchor(href_l: str, text: str) -> Optional[str]:
+    """Return the quality label for a download anchor, or None."""
+    if 'download' not in href_l and 'mp4' not in href_l:
+        return None
+    quality_match = _RE_QUALITY.search(text)
+    return quality_match.group(1) if quality_match else 'unknown'
+
+
+def _classify_subtitle_anchor(href_l: str, text: str) -> Optional[tuple]:
+    """Return (language, format) for a subtitle anchor, or None."""
+    if 'subtitle' not in href_l and '.srt' not in href_l and '.vtt' not in href_l:
+        return None
+    text_l = text.lower()
+    for token, code in _LANG_MAP:
+        if token in text_l:
+            return code, 'srt' if '.srt' in href_l else 'vtt'
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _user_agent() -> str:
+    """Pick one User-Agent string for the process.
+
+    UserAgent() loads its browser dataset on construction, so build it
+    once here instead of once per service and keep only the string.
+    """
+    return UserAgent().random
+
+
+def _dump_record(record: Dict) -> str:
+    """Serialize one mapping record to a JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record).decode('utf-8')
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _load_record(line: str) -> Dict:
+    """Parse one JSON mapping line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _make_session(user_agent: str) -> requests.Session:
+    """Build a session with a sized connection pool and retry policy.
+
+    Pooled keep-alive connections skip the TCP/TLS handshake on repeated
+    calls to the same host, and the retry policy absorbs the transient
+    429/5xx responses these services emit under load.
+    """
+    session = requests.Session()
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    session.headers.update({
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
 
 class YTDownService:
     """Interface with ytdown.to for video downloads."""
@@ -32,20 +147,21 @@ class YTDownService:
         """
         self.base_url = "https://ytdown.to/en2/"
         self.download_dir = download_dir
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.session = _make_session(_user_agent())
+        self._primed = False
         
         # Create download directory
         os.makedirs(download_dir, exist_ok=True)
-        
-        # Set up session headers
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+    
+    def _prime_session(self):
+        """Fetch the landing page once to pick up session cookies.
+
+        The landing page is static form markup, so caching it for the
+        session lifetime stands in for HTTP-level conditional requests.
+        """
+        if not self._primed:
+            self.session.get(self.base_url)
+            self._primed = True
     
     def get_download_links(self, youtube_url: str) -> Dict[str, str]:
         """
@@ -60,9 +176,7 @@ class YTDownService:
         logger.info(f"Getting download links for: {youtube_url}")
         
         try:
-            # Submit URL to ytdown.to
-            response = self.session.get(self.base_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            self._prime_session()
             
             # Find the form and submit the YouTube URL
             form_data = {
@@ -70,27 +184,21 @@ class YTDownService:
                 'submit': 'Download'
             }
             
-            # Post the form
+            # Post the form; only the anchors are pulled out of the
+            # response, the rest of the page is never visited from Python
             response = self.session.post(self.base_url, data=form_data)
-            soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract download links
             download_links = {}
             
-            # Look for download buttons/links
-            download_elements = soup.find_all('a', href=True)
-            
-            for element in download_elements:
-                href = element.get('href')
-                text = element.get_text().strip()
-                
-                # Check if this looks like a download link
-                if href and ('download' in href.lower() or 'mp4' in href.lower()):
-                    # Extract quality information
-                    quality_match = re.search(r'(\d+p)', text)
-                    quality = quality_match.group(1) if quality_match else 'unknown'
-                    
+            for href, text in _iter_anchors(response.content):
+                quality = _classify_download_anchor(href.lower(), text)
+                if quality is not None:
                     download_links[quality] = href
+                    
+                    # Every fallback quality is covered; stop scanning
+                    if _TARGET_QUALITIES <= download_links.keys():
+                        break
             
             logger.info(f"Found {len(download_links)} download options")
             return download_links
@@ -99,13 +207,15 @@ class YTDownService:
             logger.error(f"Error getting download links: {e}")
             return {}
     
-    def download_video(self, youtube_url: str, quality: str = "720p") -> Optional[str]:
+    def download_video(self, youtube_url: str, quality: str = "720p",
+                       video_id: Optional[str] = None) -> Optional[str]:
         """
         Download a video from YouTube.
         
         Args:
             youtube_url: YouTube video URL
             quality: Preferred video quality
+            video_id: Pre-extracted video ID, if the caller already has it
             
         Returns:
             Path to downloaded video file, or None if failed
@@ -131,8 +241,9 @@ class YTDownService:
                 download_url = list(download_links.values())[0]
             
             # Extract video ID for filename
-            video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', youtube_url)
-            video_id = video_id_match.group(1) if video_id_match else "unknown"
+            if video_id is None:
+                video_id_match = _RE_VIDEO_ID.search(youtube_url)
+                video_id = video_id_match.group(1) if video_id_match else "unknown"
             
             filename = f"{video_id}_{quality}.mp4"
             filepath = os.path.join(self.download_dir, filename)
@@ -144,8 +255,15 @@ class YTDownService:
             response.raise_for_status()
             
             with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                # 1 MiB chunks: tens of iterations per video instead of
+                # thousands, so far fewer small writes for large MP4s
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
                     f.write(chunk)
+                f.flush()
+                if hasattr(os, 'posix_fadvise'):
+                    # The video won't be re-read by this process; tell the
+                    # kernel not to keep it in the page cache
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
             
             logger.info(f"Video downloaded successfully: {filepath}")
             return filepath
@@ -167,20 +285,24 @@ class DownSubService:
         """
         self.base_url = "https://downsub.com/"
         self.download_dir = download_dir
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.session = _make_session(_user_agent())
+        self._primed = False
+        # Writes go through a background thread so the next subtitle
+        # request isn't stalled behind the previous file hitting disk
+        self.writer = BackgroundFileWriter()
         
         # Create download directory
         os.makedirs(download_dir, exist_ok=True)
-        
-        # Set up session headers
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+    
+    def _prime_session(self):
+        """Fetch the landing page once to pick up session cookies.
+
+        The landing page is static form markup, so caching it for the
+        session lifetime stands in for HTTP-level conditional requests.
+        """
+        if not self._primed:
+            self.session.get(self.base_url)
+            self._primed = True
     
     def get_subtitle_links(self, youtube_url: str) -> Dict[str, Dict[str, str]]:
         """
@@ -195,48 +317,35 @@ class DownSubService:
         logger.info(f"Getting subtitle links for: {youtube_url}")
         
         try:
-            # Submit URL to downsub.com
-            response = self.session.get(self.base_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            self._prime_session()
             
             # Find the form and submit the YouTube URL
             form_data = {
                 'url': youtube_url
             }
             
-            # Post the form
+            # Post the form; only the anchors are pulled out of the
+            # response, the rest of the page is never visited from Python
             response = self.session.post(self.base_url, data=form_data)
-            soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract subtitle links
             subtitle_links = {}
             
-            # Look for subtitle download links
-            subtitle_elements = soup.find_all('a', href=True)
-            
-            for element in subtitle_elements:
-                href = element.get('href')
-                text = element.get_text().strip()
-                
-                # Check if this looks like a subtitle download link
-                if href and ('subtitle' in href.lower() or '.srt' in href.lower() or '.vtt' in href.lower()):
-                    # Extract language information
-                    lang_match = re.search(r'(english|farsi|persian|fa|en)', text.lower())
+            for href, text in _iter_anchors(response.content):
+                classified = _classify_subtitle_anchor(href.lower(), text)
+                if classified is not None:
+                    lang, format_type = classified
                     
-                    if lang_match:
-                        lang = lang_match.group(1)
-                        if lang in ['farsi', 'persian']:
-                            lang = 'fa'
-                        elif lang == 'english':
-                            lang = 'en'
-                        
-                        # Determine format
-                        format_type = 'srt' if '.srt' in href.lower() else 'vtt'
-                        
-                        if lang not in subtitle_links:
-                            subtitle_links[lang] = {}
-                        
-                        subtitle_links[lang][format_type] = href
+                    if lang not in subtitle_links:
+                        subtitle_links[lang] = {}
+                    
+                    subtitle_links[lang][format_type] = href
+                    
+                    # Both target languages have the preferred SRT
+                    # format; the rest of the page can't add anything
+                    if all('srt' in subtitle_links.get(l, {})
+                           for l in _TARGET_LANGUAGES):
+                        break
             
             logger.info(f"Found subtitles for languages: {list(subtitle_links.keys())}")
             return subtitle_links
@@ -245,13 +354,15 @@ class DownSubService:
             logger.error(f"Error getting subtitle links: {e}")
             return {}
     
-    def download_subtitles(self, youtube_url: str, languages: List[str] = ['fa', 'en']) -> Dict[str, str]:
+    def download_subtitles(self, youtube_url: str, languages: List[str] = ['fa', 'en'],
+                           video_id: Optional[str] = None) -> Dict[str, str]:
         """
         Download subtitles for specified languages.
         
         Args:
             youtube_url: YouTube video URL
             languages: List of language codes to download
+            video_id: Pre-extracted video ID, if the caller already has it
             
         Returns:
             Dictionary mapping language codes to downloaded file paths
@@ -261,32 +372,47 @@ class DownSubService:
             downloaded_files = {}
             
             # Extract video ID for filename
-            video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', youtube_url)
-            video_id = video_id_match.group(1) if video_id_match else "unknown"
+            if video_id is None:
+                video_id_match = _RE_VIDEO_ID.search(youtube_url)
+                video_id = video_id_match.group(1) if video_id_match else "unknown"
             
-            for lang in languages:
-                if lang in subtitle_links:
-                    # Prefer SRT format over VTT
-                    format_type = 'srt' if 'srt' in subtitle_links[lang] else 'vtt'
-                    download_url = subtitle_links[lang][format_type]
-                    
-                    filename = f"{video_id}_{lang}.{format_type}"
-                    filepath = os.path.join(self.download_dir, filename)
-                    
-                    # Download the subtitle file
-                    logger.info(f"Downloading {lang} subtitles to: {filepath}")
-                    
-                    response = self.session.get(download_url)
-                    response.raise_for_status()
-                    
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(response.text)
-                    
-                    downloaded_files[lang] = filepath
-                    logger.info(f"Subtitles downloaded: {filepath}")
-                else:
+            def fetch_one(lang: str) -> Optional[str]:
+                if lang not in subtitle_links:
                     logger.warning(f"No subtitles found for language: {lang}")
-            
+                    return None
+                
+                # Prefer SRT format over VTT
+                format_type = 'srt' if 'srt' in subtitle_links[lang] else 'vtt'
+                download_url = subtitle_links[lang][format_type]
+                
+                filename = f"{video_id}_{lang}.{format_type}"
+                filepath = os.path.join(self.download_dir, filename)
+                
+                # Download the subtitle file
+                logger.info(f"Downloading {lang} subtitles to: {filepath}")
+                
+                response = self.session.get(download_url, stream=True)
+                response.raise_for_status()
+
+                # Stream raw chunks straight to disk on the writer
+                # thread: no full-body str decode in memory
+                self.writer.submit_stream(
+                    filepath, response.iter_content(chunk_size=65536)
+                )
+                
+                logger.info(f"Subtitles downloaded: {filepath}")
+                return filepath
+            
+            # One request per language in flight at once; the session's
+            # adapter pool is sized well past len(languages)
+            with ThreadPoolExecutor(max_workers=len(languages)) as executor:
+                for lang, filepath in zip(languages, executor.map(fetch_one, languages)):
+                    if filepath:
+                        downloaded_files[lang] = filepath
+            
+            # Make sure every queued write is on disk before handing the
+            # paths back to the caller
+            self.writer.flush()
             return downloaded_files
             
         except Exception as e:
@@ -311,6 +437,11 @@ class DownloadManager:
         
         # Create mapping file directory
         os.makedirs(os.path.dirname(self.mapping_file), exist_ok=True)
+        
+        # Keep one append handle open for the manager's lifetime; a lock
+        # serializes writers when downloads run on several threads
+        self._mapping_fp = open(self.mapping_file, 'a', encoding='utf-8')
+        self._mapping_lock = threading.Lock()
     
     def download_video_with_subtitles(self, youtube_url: str, video_quality: str = "720p", 
                                     subtitle_languages: List[str] = ['fa', 'en']) -> Dict:
@@ -336,14 +467,28 @@ class DownloadManager:
         }
         
         try:
-            # Download video
-            video_file = self.video_service.download_video(youtube_url, video_quality)
-            result['video_file'] = video_file
+            # Extract the ID once for both services
+            video_id_match = _RE_VIDEO_ID.search(youtube_url)
+            video_id = video_id_match.group(1) if video_id_match else "unknown"
             
-            # Download subtitles
-            subtitle_files = self.subtitle_service.download_subtitles(youtube_url, subtitle_languages)
+            # Video and subtitles come from different services, so their
+            # HTTP round-trips can overlap instead of running back to back
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                video_future = executor.submit(
+                    self.video_service.download_video, youtube_url, video_quality,
+                    video_id
+                )
+                subtitle_future = executor.submit(
+                    self.subtitle_service.download_subtitles, youtube_url,
+                    subtitle_languages, video_id
+                )
+
+                video_file = video_future.result()
+                subtitle_files = subtitle_future.result()
+
+            result['video_file'] = video_file
             result['subtitle_files'] = subtitle_files
-            
+
             # Update mapping file
             self._update_mapping_file(youtube_url, video_file, subtitle_files)
             
@@ -360,29 +505,48 @@ class DownloadManager:
                            subtitle_files: Dict[str, str]):
         """Update the video-subtitle mapping file."""
         try:
-            with open(self.mapping_file, 'a', encoding='utf-8') as f:
-                # Format: URL | Video File | Farsi Subtitle | English Subtitle
-                farsi_sub = subtitle_files.get('fa', 'N/A')
-                english_sub = subtitle_files.get('en', 'N/A')
-                video_path = video_file if video_file else 'N/A'
-                
-                line = f"{youtube_url} | {video_path} | {farsi_sub} | {english_sub}\n"
-                f.write(line)
+            # One JSON object per line: no delimiter ambiguity if a URL
+            # or path ever contains ' | ', and parsing is a C-level loads
+            record = {
+                'url': youtube_url,
+                'video_file': video_file if video_file else None,
+                'farsi_subtitle': subtitle_files.get('fa'),
+                'english_subtitle': subtitle_files.get('en')
+            }
+            
+            line = _dump_record(record) + '\n'
+            with self._mapping_lock:
+                self._mapping_fp.write(line)
                 
             logger.info(f"Updated mapping file: {self.mapping_file}")
             
         except Exception as e:
             logger.error(f"Error updating mapping file: {e}")
     
+    def close(self):
+        """Flush and close the mapping file handle."""
+        with self._mapping_lock:
+            if not self._mapping_fp.closed:
+                self._mapping_fp.close()
+    
     def get_mapping_summary(self) -> List[Dict]:
         """Get summary of all downloaded content."""
         summary = []
         
         try:
+            # Push any buffered lines to disk before reading them back
+            with self._mapping_lock:
+                if not self._mapping_fp.closed:
+                    self._mapping_fp.flush()
             if os.path.exists(self.mapping_file):
                 with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        parts = line.strip().split(' | ')
+                    lines = f.read().splitlines()
+                for line in lines:
+                    if line.startswith('{'):
+                        summary.append(_load_record(line))
+                    else:
+                        # Legacy ' | '-delimited line from an older run
+                        parts = line.split(' | ')
                         if len(parts) >= 4:
                             summary.append({
                                 'url': parts[0],
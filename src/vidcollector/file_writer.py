@@ -0,0 +1,65 @@
+"""Background file writing for download pipelines."""
+
+import queue
+import threading
+from typing import Optional, Tuple
+
+
+class BackgroundFileWriter:
+    """Write files on a daemon thread so callers never block on disk.
+
+    Download loops interleave network reads with small file writes; queueing
+    the writes lets the next HTTP request start while the previous payload
+    is still being flushed to disk.
+    """
+
+    _SENTINEL = (None, None)
+
+    def __init__(self, maxsize: int = 256):
+        self._queue: 'queue.Queue[Tuple[Optional[str], Optional[bytes]]]' = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def submit_write(self, path: str, data) -> None:
+        """Queue one file write; str data is encoded as UTF-8."""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._queue.put((path, data))
+
+    def submit_stream(self, path: str, chunks) -> None:
+        """Queue a streaming write from an iterable of bytes chunks.
+
+        The iterable is consumed on the writer thread, so a network
+        response body is received and written there while the caller
+        moves on to its next request.
+        """
+        self._queue.put((path, chunks))
+
+    def _drain(self):
+        while True:
+            path, data = self._queue.get()
+            try:
+                if path is None:
+                    return
+                try:
+                    with open(path, 'wb') as f:
+                        if isinstance(data, (bytes, bytearray)):
+                            f.write(data)
+                        else:
+                            for chunk in data:
+                                if chunk:
+                                    f.write(chunk)
+                except Exception as e:
+                    print(f"Error writing {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued write has hit the filesystem."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the worker thread."""
+        self.flush()
+        self._queue.put(self._SENTINEL)
+        self._thread.join()
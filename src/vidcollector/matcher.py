@@ -0,0 +1,54 @@
+"""Multi-pattern keyword matching for Farsi detection."""
+
+import re
+from typing import Iterable
+
+
+# hyperscan compiles all patterns into one JIT'd DFA and scans them in a
+# single pass; it needs a native library, so it stays optional and the
+# compiled stdlib alternation below covers the fallback.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+class KeywordMatcher:
+    """Match a fixed set of keywords against text in one linear scan."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keywords)
+        self._re = re.compile('|'.join(re.escape(k) for k in self.keywords))
+        self._hs_db = None
+
+        if hyperscan is not None and self.keywords:
+            try:
+                db = hyperscan.Database()
+                expressions = [k.encode('utf-8') for k in self.keywords]
+                db.compile(
+                    expressions=expressions,
+                    ids=list(range(len(expressions))),
+                    flags=[hyperscan.HS_FLAG_UTF8] * len(expressions)
+                )
+                self._hs_db = db
+            except Exception:
+                # Unsupported pattern or platform: stay on the re fallback
+                self._hs_db = None
+
+    def contains_any(self, text: str) -> bool:
+        """Check if the text contains any of the configured keywords."""
+        if not text:
+            return False
+
+        if self._hs_db is not None:
+            found = False
+
+            def on_match(pattern_id, start, end, flags, context):
+                nonlocal found
+                found = True
+                return 1  # non-zero stops the scan at the first hit
+
+            self._hs_db.scan(text.encode('utf-8'), match_event_handler=on_match)
+            return found
+
+        return self._re.search(text) is not None
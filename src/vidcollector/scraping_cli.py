@@ -3,14 +3,29 @@ Command-line interface for the web scraping version of VidCollector.
 """
 
 import argparse
+import json
 import logging
 import sys
 from typing import List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import Config
 from .scraping_crawler import FarsiVideoCrawler
 
 
+def _print_json(payload):
+    """Emit a payload as JSON in one buffered write."""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b'\n')
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+
+
 def setup_logging(level: str = "INFO"):
     """Setup logging configuration."""
     logging.basicConfig(
@@ -40,7 +55,8 @@ def crawl_command(args):
             stats = crawler.crawl_multiple_urls(
                 start_urls=urls,
                 max_videos_per_url=args.max_videos // len(urls) if args.max_videos else 10,
-                download_content=args.download
+                download_content=args.download,
+                concurrency=args.concurrency
             )
         else:
             stats = crawler.crawl_from_url(
@@ -76,6 +92,10 @@ def stats_command(args):
     try:
         stats = crawler.get_stats()
         
+        if args.json:
+            _print_json(stats)
+            return 0
+        
         print("\n📊 Database Statistics:")
         print(f"Total videos: {stats.get('videos', 0)}")
         print(f"Total subtitles: {stats.get('subtitles', 0)}")
@@ -122,18 +142,23 @@ def mapping_command(args):
     try:
         mappings = crawler.get_download_mapping()
         
+        if args.json:
+            _print_json({'mappings': mappings})
+            return 0
+        
         if not mappings:
             print("No download mappings found.")
             return 0
         
-        print("\n📁 Video-Subtitle Mappings:")
-        print("=" * 80)
-        
+        # Build the report once and print it in a single write instead of
+        # flushing stdout four times per mapping
+        lines = ["\n📁 Video-Subtitle Mappings:", "=" * 80]
         for i, mapping in enumerate(mappings, 1):
-            print(f"\n{i}. URL: {mapping['url']}")
-            print(f"   Video: {mapping['video_file'] or 'Not downloaded'}")
-            print(f"   Farsi Subtitle: {mapping['farsi_subtitle'] or 'Not available'}")
-            print(f"   English Subtitle: {mapping['english_subtitle'] or 'Not available'}")
+            lines.append(f"\n{i}. URL: {mapping['url']}")
+            lines.append(f"   Video: {mapping['video_file'] or 'Not downloaded'}")
+            lines.append(f"   Farsi Subtitle: {mapping['farsi_subtitle'] or 'Not available'}")
+            lines.append(f"   English Subtitle: {mapping['english_subtitle'] or 'Not available'}")
+        print('\n'.join(lines))
         
         # Save to file if requested
         if args.output:
@@ -189,6 +214,9 @@ Examples:
                              help='Maximum number of videos to process (default: 50)')
     crawl_parser.add_argument('--multiple-urls', action='store_true',
                              help='Treat start-url as comma-separated list of URLs')
+    crawl_parser.add_argument('--concurrency', type=int, default=None,
+                             help='URLs to crawl in parallel with --multiple-urls '
+                                  '(default: CRAWL_WORKERS setting)')
     crawl_parser.add_argument('--download', action='store_true', default=True,
                              help='Download videos and subtitles (default: True)')
     crawl_parser.add_argument('--no-download', dest='download', action='store_false',
@@ -199,6 +227,8 @@ Examples:
     stats_parser = subparsers.add_parser('stats', help='Show database statistics')
     stats_parser.add_argument('--downloads', action='store_true',
                              help='Include download statistics')
+    stats_parser.add_argument('--json', action='store_true',
+                             help='Emit statistics as JSON')
     stats_parser.set_defaults(func=stats_command)
     
     # Export command
@@ -213,6 +243,8 @@ Examples:
     mapping_parser = subparsers.add_parser('mapping', help='Show video-subtitle mappings')
     mapping_parser.add_argument('--output', 
                                help='Save mappings to file')
+    mapping_parser.add_argument('--json', action='store_true',
+                               help='Emit mappings as JSON')
     mapping_parser.set_defaults(func=mapping_command)
     
     args = parser.parse_args()
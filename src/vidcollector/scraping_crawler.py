@@ -4,7 +4,8 @@ Main crawler engine for collecting Farsi YouTube videos and subtitles using web
 
 import time
 import logging
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
@@ -16,6 +17,37 @@ from .download_services import DownloadManager
 logger = logging.getLogger(__name__)
 
 
+class _TokenBucket:
+    """Shared rate limiter for the crawl workers.
+
+    Each worker takes a token before processing a video; tokens refill at
+    the configured rate, so time already spent on a slow video counts
+    toward the delay instead of being added on top of it. Only workers
+    that outrun the rate ever sleep.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self._rate = rate
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._timestamp) * self._rate)
+                self._timestamp = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
 class FarsiVideoCrawler:
     """Main crawler for collecting Farsi YouTube videos and subtitles via web scraping."""
     
@@ -66,26 +98,52 @@ class FarsiVideoCrawler:
             
             logger.info(f"Found {len(farsi_videos)} Farsi videos")
             
-            # Process each video
+            # One query resolves which candidates are already stored, so
+            # the workers skip a per-video SELECT on the shared database
+            existing_ids = self.db.existing_video_ids(
+                [v.get('video_id') for v in farsi_videos if v.get('video_id')])
+            
+            # Process videos on a thread pool: _process_video is dominated
+            # by download-service round-trips, so the waits overlap. A
+            # shared token bucket paces the pool at one video per
+            # rate-limit delay overall without sleeping after videos that
+            # were already slower than the delay.
+            stats_lock = threading.Lock()
+            delay = self.config.rate_limit_delay
+            bucket = (_TokenBucket(rate=1.0 / delay, capacity=self.config.crawl_workers)
+                      if delay > 0 else None)
+            
+            def process_one(video_info: Dict) -> Dict:
+                if bucket is not None:
+                    bucket.acquire()
+                return self._process_video(video_info, download_content, existing_ids)
+            
             with tqdm(total=len(farsi_videos), desc="Processing videos") as pbar:
-                for video_info in farsi_videos:
-                    try:
-                        result = self._process_video(video_info, download_content)
-                        
-                        if result['success']:
-                            stats['videos_processed'] += 1
-                            if result.get('downloaded', False):
-                                stats['videos_downloaded'] += 1
-                            stats['subtitles_extracted'] += result.get('subtitles_count', 0)
-                        else:
-                            stats['errors'] += 1
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing video {video_info.get('video_id', 'unknown')}: {e}")
-                        stats['errors'] += 1
+                with ThreadPoolExecutor(max_workers=self.config.crawl_workers) as executor:
+                    future_to_video = {
+                        executor.submit(process_one, v): v for v in farsi_videos
+                    }
                     
-                    pbar.update(1)
-                    time.sleep(self.config.rate_limit_delay)
+                    for future in as_completed(future_to_video):
+                        video_info = future_to_video[future]
+                        try:
+                            result = future.result()
+                            
+                            with stats_lock:
+                                if result['success']:
+                                    stats['videos_processed'] += 1
+                                    if result.get('downloaded', False):
+                                        stats['videos_downloaded'] += 1
+                                    stats['subtitles_extracted'] += result.get('subtitles_count', 0)
+                                else:
+                                    stats['errors'] += 1
+                                
+                        except Exception as e:
+                            logger.error(f"Error processing video {video_info.get('video_id', 'unknown')}: {e}")
+                            with stats_lock:
+                                stats['errors'] += 1
+                        
+                        pbar.update(1)
             
             stats['duration'] = time.time() - stats['start_time']
             logger.info(f"Crawling completed: {stats}")
@@ -98,19 +156,27 @@ class FarsiVideoCrawler:
         
         return stats
     
-    def crawl_multiple_urls(self, start_urls: List[str], max_videos_per_url: int = 10, 
-                          download_content: bool = True) -> Dict:
+    def crawl_multiple_urls(self, start_urls: List[str], max_videos_per_url: int = 10,
+                          download_content: bool = True,
+                          concurrency: Optional[int] = None) -> Dict:
         """
         Crawl multiple starting URLs.
-        
+
         Args:
             start_urls: List of starting YouTube URLs
             max_videos_per_url: Maximum videos to find from each URL
             download_content: Whether to download videos and subtitles
-            
+            concurrency: Number of URLs to crawl in parallel; each worker
+                runs its own browser session. Defaults to the configured
+                crawl worker count — the URLs are independent, so one
+                slow page no longer holds up the rest.
+
         Returns:
             Combined crawling statistics
         """
+        if concurrency is None:
+            concurrency = min(len(start_urls), self.config.crawl_workers)
+        
         combined_stats = {
             'videos_found': 0,
             'videos_processed': 0,
@@ -121,32 +187,56 @@ class FarsiVideoCrawler:
             'urls_processed': 0,
             'start_urls': start_urls
         }
-        
-        for url in start_urls:
-            logger.info(f"Processing URL {combined_stats['urls_processed'] + 1}/{len(start_urls)}: {url}")
-            
-            try:
-                stats = self.crawl_from_url(url, max_videos_per_url, download_content)
-                
-                # Combine statistics
-                combined_stats['videos_found'] += stats.get('videos_found', 0)
-                combined_stats['videos_processed'] += stats.get('videos_processed', 0)
-                combined_stats['videos_downloaded'] += stats.get('videos_downloaded', 0)
-                combined_stats['subtitles_extracted'] += stats.get('subtitles_extracted', 0)
-                combined_stats['errors'] += stats.get('errors', 0)
-                combined_stats['urls_processed'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing URL {url}: {e}")
-                combined_stats['errors'] += 1
-        
+
+        def merge(stats: Dict):
+            for key in ('videos_found', 'videos_processed', 'videos_downloaded',
+                        'subtitles_extracted', 'errors'):
+                combined_stats[key] += stats.get(key, 0)
+            combined_stats['urls_processed'] += 1
+
+        if concurrency > 1 and len(start_urls) > 1:
+            # One crawler (and browser session) per worker: the shared
+            # scraper isn't safe to drive from several threads, and the
+            # per-URL page latency dwarfs the extra browser startup
+            def crawl_one(url: str) -> Dict:
+                worker = FarsiVideoCrawler(self.config)
+                try:
+                    return worker.crawl_from_url(url, max_videos_per_url, download_content)
+                finally:
+                    worker.cleanup()
+
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(start_urls))) as executor:
+                future_to_url = {executor.submit(crawl_one, url): url for url in start_urls}
+
+                for future in as_completed(future_to_url):
+                    url = future_to_url[future]
+                    try:
+                        merge(future.result())
+                    except Exception as e:
+                        logger.error(f"Error processing URL {url}: {e}")
+                        combined_stats['errors'] += 1
+        else:
+            for url in start_urls:
+                logger.info(f"Processing URL {combined_stats['urls_processed'] + 1}/{len(start_urls)}: {url}")
+
+                try:
+                    merge(self.crawl_from_url(url, max_videos_per_url, download_content))
+                except Exception as e:
+                    logger.error(f"Error processing URL {url}: {e}")
+                    combined_stats['errors'] += 1
+
         combined_stats['duration'] = time.time() - combined_stats['start_time']
         logger.info(f"Multi-URL crawling completed: {combined_stats}")
-        
+
         return combined_stats
     
-    def _process_video(self, video_info: Dict, download_content: bool = True) -> Dict:
-        """Process a single video: store metadata and optionally download content."""
+    def _process_video(self, video_info: Dict, download_content: bool = True,
+                       existing_ids: Optional[Set[str]] = None) -> Dict:
+        """Process a single video: store metadata and optionally download content.
+
+        existing_ids, when given, is a pre-fetched set of stored video IDs
+        consulted instead of a per-video database lookup.
+        """
         result = {
             'video_id': video_info.get('video_id'),
             'success': False,
@@ -162,25 +252,17 @@ class FarsiVideoCrawler:
                 return result
             
             # Check if video already processed
-            if self.db.video_exists(video_id):
+            already_stored = (video_id in existing_ids if existing_ids is not None
+                              else self.db.video_exists(video_id))
+            if already_stored:
                 logger.debug(f"Video {video_id} already processed")
                 result['success'] = True
                 return result
             
-            # Store video metadata in database
-            self.db.insert_video(
-                video_id=video_id,
-                title=video_info.get('title', ''),
-                description=video_info.get('description', ''),
-                channel_title=video_info.get('channel', ''),
-                published_at='',  # Not available from scraping
-                duration=video_info.get('duration', ''),
-                view_count=0,  # Parse from views string if needed
-                like_count=0,  # Not available from scraping
-                language='fa',  # Detected as Farsi
-                url=video_info.get('url', ''),
-                farsi_score=video_info.get('farsi_score', 0.0)
-            )
+            # Collect subtitle contents before touching the database so
+            # the write transaction below is never held open across
+            # network or file I/O
+            subtitles = []
             
             # Download video and subtitles if requested
             if download_content:
@@ -194,31 +276,57 @@ class FarsiVideoCrawler:
                     if download_result.get('success', False):
                         result['downloaded'] = True
                         
-                        # Store subtitle information in database
-                        for lang, subtitle_file in download_result.get('subtitle_files', {}).items():
-                            if subtitle_file:
-                                # Read subtitle content
-                                try:
-                                    with open(subtitle_file, 'r', encoding='utf-8') as f:
-                                        subtitle_content = f.read()
-                                    
-                                    self.db.insert_subtitle(
-                                        video_id=video_id,
-                                        language=lang,
-                                        content=subtitle_content,
-                                        format_type='srt' if subtitle_file.endswith('.srt') else 'vtt',
-                                        source='downsub.com',
-                                        file_path=subtitle_file
-                                    )
-                                    result['subtitles_count'] += 1
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error reading subtitle file {subtitle_file}: {e}")
+                        def read_one(item):
+                            lang, subtitle_file = item
+                            try:
+                                with open(subtitle_file, 'r', encoding='utf-8') as f:
+                                    return lang, f.read(), subtitle_file
+                            except Exception as e:
+                                logger.error(f"Error reading subtitle file {subtitle_file}: {e}")
+                                return None
+                        
+                        subtitle_files = [
+                            item for item in download_result.get('subtitle_files', {}).items()
+                            if item[1]
+                        ]
+                        if subtitle_files:
+                            # Independent small reads; overlapping them keeps
+                            # one cold file from serializing the rest
+                            with ThreadPoolExecutor(max_workers=min(4, len(subtitle_files))) as reader:
+                                subtitles = [r for r in reader.map(read_one, subtitle_files) if r]
                     
                 except Exception as e:
                     logger.error(f"Error downloading content for {video_id}: {e}")
                     # Continue processing even if download fails
             
+            # One transaction for the video row and all its subtitles:
+            # a single fsync per video instead of one per insert
+            try:
+                self.db.begin()
+                self.db.insert_video(
+                    video_id=video_id,
+                    title=video_info.get('title', ''),
+                    description=video_info.get('description', ''),
+                    channel_title=video_info.get('channel', ''),
+                    published_at='',  # Not available from scraping
+                    duration=video_info.get('duration', ''),
+                    view_count=0,  # Parse from views string if needed
+                    like_count=0,  # Not available from scraping
+                    language='fa',  # Detected as Farsi
+                    url=video_info.get('url', ''),
+                    farsi_score=video_info.get('farsi_score', 0.0)
+                )
+                result['subtitles_count'] = self.db.insert_subtitles_many([
+                    (video_id, lang,
+                     'srt' if subtitle_file.endswith('.srt') else 'vtt',
+                     subtitle_content, subtitle_file)
+                    for lang, subtitle_content, subtitle_file in subtitles
+                ])
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
             result['success'] = True
             logger.debug(f"Successfully processed video {video_id}")
             
@@ -1,16 +1,102 @@
 """Subtitle extraction using yt-dlp."""
 
 import os
+import re
 import json
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+import requests
 import yt_dlp
-import webvtt
 import pysrt
 from langdetect import detect
 from langdetect.lang_detect_exception import LangDetectException
 
+from .config import normalize_farsi
+
+# Farsi/Persian Unicode ranges (Arabic, Arabic Supplement, presentation forms).
+# The search method is bound once so the hot detection path skips the
+# attribute lookup per call.
+_FARSI_RE = re.compile(r'[\u0600-\u06FF\u0750-\u077F\uFB50-\uFDFF\uFE70-\uFEFF]')
+_farsi_search = _FARSI_RE.search
+
+# Subtitle artifacts removed during cleaning: HTML tags, [Music]-style and
+# (Applause)-style annotations, fused into one alternation so cleaning is a
+# single pass over the text.
+_CLEAN_RE = re.compile(r'<[^>]+>|\[[^\]]*\]|\([^)]*\)')
+_WS_RE = re.compile(r'\s+')
+_clean_sub = _CLEAN_RE.sub
+_ws_sub = _WS_RE.sub
+
+# pyahocorasick sweeps every fixed cue marker in one C-level automaton pass
+# that does not slow down as the marker list grows; it needs a native
+# extension, so it stays optional and the fused alternation above keeps
+# covering everything when it is absent.
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+# Fixed cue markers seen across subtitle corpora. Open-ended <tag>/[...]
+# forms still fall through to _CLEAN_RE afterwards.
+_CUE_MARKERS = (
+    '[Music]', '[Applause]', '[Laughter]', '[Cheering]',
+    '[موسیقی]', '[تشویق]', '[خنده]', '♪', '♫',
+)
+
+def _build_cue_automaton():
+    """Compile the fixed cue markers into one Aho-Corasick automaton."""
+    if _ahocorasick is None:
+        return None
+    automaton = _ahocorasick.Automaton()
+    for marker in _CUE_MARKERS:
+        automaton.add_word(marker, len(marker))
+    automaton.make_automaton()
+    return automaton
+
+_CUE_AUTOMATON = _build_cue_automaton()
+
+def _strip_cue_markers(text: str) -> str:
+    """Splice out fixed cue markers found in a single automaton pass."""
+    if _CUE_AUTOMATON is None:
+        return text
+    pieces = []
+    last = 0
+    for end, length in _CUE_AUTOMATON.iter(text):
+        start = end - length + 1
+        if start >= last:
+            pieces.append(text[last:start])
+            last = end + 1
+    if not pieces:
+        return text
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
+def _is_detected_farsi(sentence: str) -> bool:
+    """Ask langdetect whether an ambiguous-script sentence is Farsi."""
+    try:
+        return detect(sentence) == 'fa'
+    except LangDetectException:
+        return False
+
+def _clean_subtitle_text_worker(item: Tuple[str, str]) -> Tuple[str, str]:
+    """Process-pool worker: normalize and clean one (video_id, text) pair.
+
+    Cleans line by line so the cue-per-line structure of parsed subtitle
+    content survives; lines emptied by cleaning are dropped, matching the
+    inline per-cue path. Top-level so it pickles for ProcessPoolExecutor;
+    each worker process pays the regex compilation once at module import.
+    """
+    video_id, raw_text = item
+    cleaned_lines = []
+    for line in normalize_farsi(raw_text).split('\n'):
+        line = _ws_sub(' ', _clean_sub('', _strip_cue_markers(line))).strip()
+        if line:
+            cleaned_lines.append(line)
+    return video_id, '\n'.join(cleaned_lines)
+
 class SubtitleExtractor:
     """Extract subtitles from YouTube videos using yt-dlp."""
     
@@ -29,70 +115,95 @@ class SubtitleExtractor:
             'quiet': True,
             'no_warnings': True
         }
+        
+        # One YoutubeDL per thread, built lazily: construction loads every
+        # extractor and its regexes, so paying it once per thread instead
+        # of once per video saves a fixed cost on each extraction.
+        # YoutubeDL itself is not thread-safe, hence thread-local rather
+        # than a single shared instance.
+        self._local = threading.local()
+        
+        # Pooled session for fetching subtitle files; keep-alive reuses
+        # the TLS connection across a video's subtitle variants
+        self._http = requests.Session()
+    
+    def _ydl(self) -> yt_dlp.YoutubeDL:
+        """Return this thread's reusable YoutubeDL instance."""
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+            self._local.ydl = ydl
+        return ydl
     
-    def extract_subtitles(self, video_id: str, video_url: str = None) -> Dict[str, Dict]:
+    def extract_subtitles(self, video_id: str, video_url: str = None,
+                          clean: bool = True) -> Dict[str, Dict]:
         """
         Extract subtitles for a video.
-        
+
         Args:
             video_id: YouTube video ID
             video_url: Full YouTube URL (optional, will be constructed if not provided)
-        
+            clean: Clean cue text inline. Batch callers pass False and run
+                batch_clean_subtitle_texts over many videos at once instead
+
         Returns:
             Dict with subtitle information for each language
         """
         if not video_url:
             video_url = f"https://www.youtube.com/watch?v={video_id}"
-        
+
         subtitles_info = {}
-        
+
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                # Extract info to see available subtitles
-                info = ydl.extract_info(video_url, download=False)
-                
-                available_subs = info.get('subtitles', {})
-                auto_subs = info.get('automatic_captions', {})
-                
-                # Process manual subtitles
-                for lang, sub_list in available_subs.items():
-                    if lang in ['fa', 'en']:
-                        subtitle_data = self._download_and_process_subtitle(
-                            video_id, lang, sub_list, 'manual'
-                        )
-                        if subtitle_data:
-                            subtitles_info[f"{lang}_manual"] = subtitle_data
-                
-                # Process automatic subtitles
-                for lang, sub_list in auto_subs.items():
-                    if lang in ['fa', 'en']:
-                        subtitle_data = self._download_and_process_subtitle(
-                            video_id, lang, sub_list, 'auto'
-                        )
-                        if subtitle_data:
-                            subtitles_info[f"{lang}_auto"] = subtitle_data
-                
-                # If no Farsi subtitles found, try to detect Farsi in English auto-captions
-                if not any('fa' in key for key in subtitles_info.keys()):
-                    if 'en_auto' in subtitles_info:
-                        farsi_content = self._detect_farsi_in_subtitles(
-                            subtitles_info['en_auto']['content']
-                        )
-                        if farsi_content:
-                            subtitles_info['fa_detected'] = {
-                                'content': farsi_content,
-                                'type': 'detected',
-                                'language': 'fa',
-                                'file_path': None
-                            }
+            # Extract info to see available subtitles
+            info = self._ydl().extract_info(video_url, download=False)
+
+            available_subs = info.get('subtitles', {})
+            auto_subs = info.get('automatic_captions', {})
+            found_fa = False
+            
+            # Process manual subtitles
+            for lang, sub_list in available_subs.items():
+                if lang in ['fa', 'en']:
+                    subtitle_data = self._download_and_process_subtitle(
+                        video_id, lang, sub_list, 'manual', clean
+                    )
+                    if subtitle_data:
+                        subtitles_info[f"{lang}_manual"] = subtitle_data
+                        found_fa = found_fa or lang == 'fa'
+            
+            # Process automatic subtitles
+            for lang, sub_list in auto_subs.items():
+                if lang in ['fa', 'en']:
+                    subtitle_data = self._download_and_process_subtitle(
+                        video_id, lang, sub_list, 'auto', clean
+                    )
+                    if subtitle_data:
+                        subtitles_info[f"{lang}_auto"] = subtitle_data
+                        found_fa = found_fa or lang == 'fa'
+            
+            # If no Farsi subtitles found, try to detect Farsi in English auto-captions
+            if not found_fa:
+                if 'en_auto' in subtitles_info:
+                    farsi_content = self._detect_farsi_in_subtitles(
+                        subtitles_info['en_auto']['content']
+                    )
+                    if farsi_content:
+                        subtitles_info['fa_detected'] = {
+                            'content': farsi_content,
+                            'type': 'detected',
+                            'language': 'fa',
+                            'file_path': None
+                        }
         
         except Exception as e:
             print(f"Error extracting subtitles for {video_id}: {e}")
         
         return subtitles_info
     
-    def _download_and_process_subtitle(self, video_id: str, lang: str, 
-                                     sub_list: List[Dict], sub_type: str) -> Optional[Dict]:
+    def _download_and_process_subtitle(self, video_id: str, lang: str,
+                                     sub_list: List[Dict], sub_type: str,
+                                     clean: bool = True) -> Optional[Dict]:
         """Download and process a subtitle file."""
         try:
             # Find VTT format subtitle
@@ -105,66 +216,60 @@ class SubtitleExtractor:
             if not vtt_sub:
                 return None
             
-            # Download subtitle
-            subtitle_url = vtt_sub['url']
+            # The info extraction already resolved the direct subtitle
+            # URL, so fetch it straight away instead of a second yt-dlp
+            # download pass that would re-extract the whole video
             subtitle_filename = f"{video_id}_{lang}_{sub_type}.vtt"
             subtitle_path = self.output_dir / subtitle_filename
             
-            # Use yt-dlp to download the subtitle
-            ydl_opts = {
-                'writesubtitles': True,
-                'subtitleslangs': [lang],
-                'subtitlesformat': 'vtt',
-                'skip_download': True,
-                'outtmpl': str(self.output_dir / f'{video_id}.%(ext)s'),
-                'quiet': True
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-            
-            # Find the downloaded subtitle file
-            possible_files = [
-                self.output_dir / f"{video_id}.{lang}.vtt",
-                self.output_dir / f"{video_id}.{lang}-orig.vtt",
-                self.output_dir / f"{video_id}.{lang}.{sub_type}.vtt"
-            ]
-            
-            subtitle_file = None
-            for file_path in possible_files:
-                if file_path.exists():
-                    subtitle_file = file_path
-                    break
-            
-            if not subtitle_file:
-                return None
+            response = self._http.get(vtt_sub['url'], timeout=30)
+            response.raise_for_status()
+            subtitle_path.write_bytes(response.content)
             
             # Parse subtitle content
-            content = self._parse_vtt_file(subtitle_file)
+            content = self._parse_vtt_file(subtitle_path, clean)
             
             return {
                 'content': content,
                 'type': sub_type,
                 'language': lang,
-                'file_path': str(subtitle_file)
+                'file_path': str(subtitle_path)
             }
             
         except Exception as e:
             print(f"Error processing subtitle {lang}_{sub_type} for {video_id}: {e}")
             return None
     
-    def _parse_vtt_file(self, file_path: Path) -> str:
-        """Parse VTT subtitle file and extract text content."""
+    def _parse_vtt_file(self, file_path: Path, clean: bool = True) -> str:
+        """Parse VTT subtitle file and extract text content.
+
+        Only the cue text matters here, so the file is split into blocks
+        and everything after each timing line is taken directly — no
+        per-cue caption objects or timestamp parsing like webvtt does.
+        With clean=False the cue text is returned unnormalized so a batch
+        caller can clean many videos in one process-pool pass.
+        """
         try:
-            captions = webvtt.read(str(file_path))
-            text_content = []
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                data = f.read()
             
-            for caption in captions:
-                # Clean up the text (remove HTML tags, extra whitespace)
-                text = caption.text.strip()
-                text = self._clean_subtitle_text(text)
-                if text:
-                    text_content.append(text)
+            text_content = []
+            for block in data.split('\n\n'):
+                lines = block.splitlines()
+                # Cue text follows the timing line; header, NOTE and
+                # STYLE blocks have no '-->' and fall through
+                for i, line in enumerate(lines):
+                    if '-->' in line:
+                        text = '\n'.join(lines[i + 1:]).strip()
+                        if clean:
+                            # Normalize Arabic/Persian codepoint variants,
+                            # then clean up the text (remove HTML tags,
+                            # extra whitespace)
+                            text = self._clean_subtitle_text(
+                                normalize_farsi(text))
+                        if text:
+                            text_content.append(text)
+                        break
             
             return '\n'.join(text_content)
             
@@ -172,47 +277,48 @@ class SubtitleExtractor:
             print(f"Error parsing VTT file {file_path}: {e}")
             return ""
     
-    def _clean_subtitle_text(self, text: str) -> str:
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Fold Arabic codepoint variants (ي/ك/ة, digits) to Persian forms.
+
+        One str.translate pass via config.normalize_farsi, shared with the
+        keyword-matching path so storage and detection see the same
+        canonical text.
+        """
+        return normalize_farsi(text)
+
+    @staticmethod
+    def _clean_subtitle_text(text: str) -> str:
         """Clean subtitle text by removing HTML tags and formatting."""
-        import re
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove common subtitle artifacts
-        text = re.sub(r'\[.*?\]', '', text)  # Remove [Music], [Applause], etc.
-        text = re.sub(r'\(.*?\)', '', text)  # Remove (Music), (Applause), etc.
-        
+        # Known cue markers go first through the automaton (when available),
+        # then one regex pass removes HTML tags and any leftover
+        # [Music]/(Applause)-style artifacts
+        text = _clean_sub('', _strip_cue_markers(text))
+
         # Remove multiple whitespaces (after removing other elements)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return _ws_sub(' ', text).strip()
     
     def _detect_farsi_in_subtitles(self, subtitle_content: str) -> Optional[str]:
         """Detect Farsi content in subtitle text."""
         try:
-            # Split content into sentences
-            sentences = subtitle_content.split('\n')
-            farsi_sentences = []
+            # One whole-content scan settles the overwhelmingly common
+            # English-only case before any per-line work happens
+            if not self._contains_farsi_chars(subtitle_content):
+                return None
             
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if not sentence:
-                    continue
-                
-                try:
-                    # Check if sentence contains Farsi characters
-                    if self._contains_farsi_chars(sentence):
-                        farsi_sentences.append(sentence)
-                    else:
-                        # Try language detection
-                        detected_lang = detect(sentence)
-                        if detected_lang == 'fa':
-                            farsi_sentences.append(sentence)
-                except LangDetectException:
-                    # If language detection fails, check for Farsi characters
-                    if self._contains_farsi_chars(sentence):
-                        farsi_sentences.append(sentence)
+            # One comprehension drives the whole scan: the common
+            # all-ASCII English line is rejected by a single C-level
+            # isascii call, Farsi-codepoint lines are kept by the
+            # compiled regex, and only the rare ambiguous-script
+            # remainder pays for a langdetect profile
+            farsi_sentences = [
+                sentence
+                for line in subtitle_content.split('\n')
+                if (sentence := line.strip())
+                and not sentence.isascii()
+                and (_farsi_search(sentence) is not None
+                     or _is_detected_farsi(sentence))
+            ]
             
             if farsi_sentences:
                 return '\n'.join(farsi_sentences)
@@ -224,41 +330,77 @@ class SubtitleExtractor:
     
     def _contains_farsi_chars(self, text: str) -> bool:
         """Check if text contains Farsi/Persian characters."""
-        farsi_range = range(0x0600, 0x06FF + 1)  # Arabic/Persian Unicode range
-        return any(ord(char) in farsi_range for char in text)
+        # Pure-ASCII text (the common case for English captions) can never
+        # match; str.isascii() bails out far cheaper than the regex scan.
+        if not text or text.isascii():
+            return False
+        return _farsi_search(text) is not None
     
     def get_subtitle_stats(self, subtitle_content: str) -> Dict:
         """Get statistics about subtitle content."""
-        lines = [line.strip() for line in subtitle_content.split('\n') if line.strip()]
-        
+        # Each statistic comes from one C-level string call; whitespace
+        # split over the whole content counts the same words as a
+        # per-line split, without the Python-level loop per line
+        lines = [stripped for line in subtitle_content.splitlines()
+                 if (stripped := line.strip())]
+        total_lines = len(lines)
+        line_length_sum = sum(map(len, lines))
+
         return {
-            'total_lines': len(lines),
+            'total_lines': total_lines,
             'total_characters': len(subtitle_content),
             'total_words': len(subtitle_content.split()),
             'has_farsi_chars': self._contains_farsi_chars(subtitle_content),
-            'avg_line_length': sum(len(line) for line in lines) / len(lines) if lines else 0
+            'avg_line_length': line_length_sum / total_lines if total_lines else 0
         }
     
     def cleanup_temp_files(self, video_id: str):
         """Clean up temporary subtitle files for a video."""
         try:
-            pattern = f"{video_id}*"
-            for file_path in self.output_dir.glob(pattern):
-                if file_path.is_file():
-                    file_path.unlink()
+            # scandir with a plain prefix test: no fnmatch per entry and
+            # no Path objects, and entry.is_file() reads the dirent type
+            # without an extra stat on most filesystems
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(video_id) and entry.is_file():
+                        os.unlink(entry.path)
         except Exception as e:
             print(f"Error cleaning up files for {video_id}: {e}")
     
+    def batch_clean_subtitle_texts(self, items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Clean many (video_id, text) pairs in parallel across CPU cores.
+
+        Cleaning is pure regex work and GIL-bound per thread, so large
+        batches are distributed over a process pool. Small batches stay on
+        the serial path where worker startup would dominate.
+        """
+        if len(items) < 32:
+            return [_clean_subtitle_text_worker(item) for item in items]
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(_clean_subtitle_text_worker, items, chunksize=64))
+
     def batch_extract_subtitles(self, video_ids: List[str]) -> Dict[str, Dict]:
-        """Extract subtitles for multiple videos."""
+        """Extract subtitles for multiple videos.
+
+        Extraction is network-bound (one yt-dlp info request plus the
+        subtitle fetches per video), so the videos run on a thread pool;
+        each worker thread gets its own YoutubeDL via _ydl().
+        """
         results = {}
+        if not video_ids:
+            return results
         
-        for video_id in video_ids:
+        def extract_one(video_id: str) -> Dict:
             print(f"Extracting subtitles for {video_id}...")
-            subtitles = self.extract_subtitles(video_id)
-            results[video_id] = subtitles
-            
-            # Optional: Clean up temporary files after processing
-            # self.cleanup_temp_files(video_id)
+            return self.extract_subtitles(video_id)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(video_ids))) as executor:
+            for video_id, subtitles in zip(video_ids,
+                                           executor.map(extract_one, video_ids)):
+                results[video_id] = subtitles
+                
+                # Optional: Clean up temporary files after processing
+                # self.cleanup_temp_files(video_id)
         
         return results
\ No newline at end of file
@@ -1,12 +1,192 @@
 """YouTube API integration for VidCollector."""
 
+import os
+import re
+import json
 import time
+import random
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Iterator
+import httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 import isodate
 from .config import Config
 
+# YouTube Data API default daily allowance, in quota units
+_DAILY_QUOTA_LIMIT = 10000
+
+# Common hour/minute/second ISO-8601 durations, parsed without isodate
+_ISO_DURATION_FAST_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+
+@lru_cache(maxsize=8192)
+def _iso_to_seconds(iso: str) -> int:
+    """Convert an ISO-8601 duration to seconds.
+
+    Duration strings repeat heavily across result batches, so results
+    are memoized; the usual PT#H#M#S shape is decoded with one regex
+    match, leaving isodate's pure-Python parser for day-bearing and
+    otherwise unusual forms.
+    """
+    match = _ISO_DURATION_FAST_RE.fullmatch(iso)
+    if match:
+        hours, minutes, seconds = (int(g) if g else 0 for g in match.groups())
+        return hours * 3600 + minutes * 60 + seconds
+    return int(isodate.parse_duration(iso).total_seconds())
+
+
+class QuotaExceededError(Exception):
+    """Raised when the daily quota is (or would be) exhausted.
+
+    Carries the search page token that was in flight, when known, so a
+    caller can resume from that page instead of re-spending quota on
+    pages it already consumed.
+    """
+
+    def __init__(self, message: str, next_page_token: Optional[str] = None):
+        super().__init__(message)
+        self.next_page_token = next_page_token
+
+
+class _DetailCache:
+    """SQLite-backed cache of videos.list payloads keyed by video ID.
+
+    Steady-state crawls re-resolve mostly the same IDs day after day,
+    and a detail row rarely changes within the TTL — serving it from
+    disk skips the API call, its quota unit, and the network round-trip
+    outright. Expired entries are revalidated with If-None-Match: the
+    response etag of each exact ID set is kept so a repeat lookup can
+    send it and, on 304 Not Modified, reuse the stored payloads with a
+    refreshed TTL instead of re-downloading them.
+    """
+
+    def __init__(self, path: str, ttl: int):
+        self._ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS video_details ('
+                'video_id TEXT PRIMARY KEY, etag TEXT, payload TEXT, ts INTEGER)')
+            # Response-level etags keyed by the exact comma-joined ID set;
+            # a list response can only be revalidated as a whole
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS list_etags ('
+                'ids TEXT PRIMARY KEY, etag TEXT)')
+            self._conn.commit()
+
+    def get_fresh(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Return {video_id: payload} for entries younger than the TTL."""
+        cutoff = int(time.time()) - self._ttl
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            for i in range(0, len(video_ids), 900):
+                chunk = video_ids[i:i + 900]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT video_id, payload FROM video_details '
+                    f'WHERE ts >= ? AND video_id IN ({placeholders})',
+                    [cutoff, *chunk]).fetchall()
+                for video_id, payload in rows:
+                    found[video_id] = json.loads(payload)
+        return found
+
+    def get_stale(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Return stored payloads regardless of age (for 304 revalidation)."""
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            for i in range(0, len(video_ids), 900):
+                chunk = video_ids[i:i + 900]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT video_id, payload FROM video_details '
+                    f'WHERE video_id IN ({placeholders})', chunk).fetchall()
+                for video_id, payload in rows:
+                    found[video_id] = json.loads(payload)
+        return found
+
+    def refresh(self, video_ids: List[str]):
+        """Restart the TTL on entries a 304 confirmed as still current."""
+        now = int(time.time())
+        with self._lock:
+            for i in range(0, len(video_ids), 900):
+                chunk = video_ids[i:i + 900]
+                placeholders = ','.join('?' * len(chunk))
+                self._conn.execute(
+                    f'UPDATE video_details SET ts = ? '
+                    f'WHERE video_id IN ({placeholders})', [now, *chunk])
+            self._conn.commit()
+
+    def get_list_etag(self, ids_key: str) -> Optional[str]:
+        """Return the stored response etag for this exact ID set, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag FROM list_etags WHERE ids = ?',
+                (ids_key,)).fetchone()
+        return row[0] if row else None
+
+    def put_list_etag(self, ids_key: str, etag: str):
+        """Remember a response etag for later If-None-Match revalidation."""
+        if not etag:
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO list_etags VALUES (?, ?)',
+                (ids_key, etag))
+            self._conn.commit()
+
+    def put_many(self, items: List[Dict]):
+        """Store freshly fetched detail rows with their etags."""
+        now = int(time.time())
+        rows = [(item['id'], item.get('etag', ''), json.dumps(item), now)
+                for item in items if item.get('id')]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO video_details VALUES (?, ?, ?, ?)', rows)
+            self._conn.commit()
+
+
+class _QuotaBucket:
+    """Token bucket over quota units shared by all API methods.
+
+    The bucket refills at one search's worth of units per rate-limit
+    delay, so cheap calls (1 unit) barely block while searches (100
+    units) are paced the way the old fixed sleep paced pages — but a
+    fast response no longer forces a full idle delay before the next
+    call.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float):
+        """Block until `cost` tokens are available, then consume them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait = (cost - self._tokens) / self._rate
+            time.sleep(wait)
+
+
 class YouTubeAPI:
     """YouTube Data API v3 wrapper for searching and retrieving video information."""
     
@@ -15,10 +195,101 @@ class YouTubeAPI:
         if not self.api_key:
             raise ValueError("YouTube API key is required")
         
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+        # One keep-alive transport per thread: httplib2 caches the TLS
+        # connection to googleapis.com inside an Http object, so reusing
+        # it amortises the handshake across calls, but it is not thread-
+        # safe — and search prefetching runs calls from a helper thread
+        self._http_local = threading.local()
+        self.youtube = build('youtube', 'v3', developerKey=self.api_key,
+                             requestBuilder=self._build_request)
         self.quota_used = 0
+        # channel_id -> uploads playlist ID, cached for the client's
+        # lifetime so repeat channel harvests skip the channels.list call
+        self._uploads_playlists: Dict[str, str] = {}
+        # (video_id, etag) -> parsed info; pagination replays and keyword
+        # overlap resurface the same resources, and an unchanged etag
+        # guarantees the cached parse is still valid
+        self._parsed_cache: Dict[tuple, Optional[Dict]] = {}
+        self._detail_cache = _DetailCache(Config.API_CACHE_PATH, Config.API_CACHE_TTL)
+        
+        delay = Config.RATE_LIMIT_DELAY or 1.0
+        self._bucket = _QuotaBucket(rate=100.0 / delay, capacity=400.0)
+    
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """requestBuilder hook: issue requests on this thread's transport."""
+        local_http = getattr(self._http_local, 'http', None)
+        if local_http is None:
+            local_http = httplib2.Http(timeout=60)
+            self._http_local.http = local_http
+        return HttpRequest(local_http, *args, **kwargs)
     
-    def search_videos(self, query: str, max_results: int = 50, 
+    def _spend(self, cost: int):
+        """Account for an API call: pace it and track quota, failing
+        fast when the daily allowance would be exceeded rather than
+        letting the server reject the request after the fact."""
+        if self.quota_used + cost > _DAILY_QUOTA_LIMIT:
+            raise QuotaExceededError(
+                f"Daily quota limit reached ({self.quota_used}/{_DAILY_QUOTA_LIMIT} units)")
+        self._bucket.acquire(cost)
+        self.quota_used += cost
+    
+    def _execute(self, request, attempts: int = 6):
+        """Execute an API request, retrying transient failures.
+
+        429/500/503 responses are retried with exponential backoff plus
+        jitter, honouring a server Retry-After header when present; a
+        403 quota rejection becomes QuotaExceededError so callers can
+        distinguish it from a bad key and resume later. Anything else
+        propagates immediately.
+        """
+        for attempt in range(attempts):
+            try:
+                return request.execute()
+            except HttpError as e:
+                status = e.resp.status
+                if status in (429, 500, 503) and attempt < attempts - 1:
+                    try:
+                        wait = float(e.resp.get('retry-after'))
+                    except (TypeError, ValueError):
+                        wait = float(2 ** attempt)
+                    time.sleep(min(wait, 60.0) + random.random())
+                    continue
+                if status == 403 and 'quotaexceeded' in str(e).lower():
+                    raise QuotaExceededError(f"Daily quota exhausted: {e}") from e
+                raise
+    
+    def _load_search_state(self) -> Dict:
+        try:
+            with open(Config.SEARCH_STATE_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_search_state(self, key: str, token: Optional[str], done: bool = False):
+        """Atomically record the page token a search should resume from.
+
+        A falsy token clears the record, unless `done` marks the search
+        finished — date-binned windows are immutable history, so a
+        completed bin is remembered and never re-searched.
+        """
+        state = self._load_search_state()
+        if token:
+            state[key] = {'token': token, 'ts': int(time.time())}
+        elif done:
+            state[key] = {'done': True, 'ts': int(time.time())}
+        else:
+            state.pop(key, None)
+
+        path = Config.SEARCH_STATE_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def search_videos(self, query: str, max_results: int = 50,
                      language: str = 'fa', region_code: str = 'IR',
                      published_after: str = None, published_before: str = None,
                      duration: str = 'medium') -> Iterator[Dict]:
@@ -54,46 +325,119 @@ class YouTubeAPI:
                 search_params['publishedAfter'] = published_after
             if published_before:
                 search_params['publishedBefore'] = published_before
-            
-            next_page_token = None
+
+            # Pick up where a previous run stopped (quota exhaustion or
+            # restart) instead of re-spending 100 units per seen page.
+            # Date-windowed searches get their own state key so bins
+            # don't clobber each other's progress.
+            windowed = bool(published_after or published_before)
+            state_key = (f"{query}|{published_after or ''}|{published_before or ''}"
+                         if windowed else query)
+            saved = self._load_search_state().get(state_key)
+            if saved:
+                if windowed and saved.get('done'):
+                    return
+                if saved.get('token'):
+                    search_params['pageToken'] = saved['token']
+
             videos_found = 0
             
-            while videos_found < max_results:
-                if next_page_token:
-                    search_params['pageToken'] = next_page_token
-                
-                # Make API request
-                search_response = self.youtube.search().list(**search_params).execute()
-                self.quota_used += 100  # Search costs 100 quota units
-                
-                video_ids = [item['id']['videoId'] for item in search_response['items']]
-                
-                if not video_ids:
-                    break
-                
-                # Get detailed video information
-                videos_response = self.youtube.videos().list(
-                    part='snippet,statistics,contentDetails,status',
-                    id=','.join(video_ids)
-                ).execute()
-                self.quota_used += 1  # Videos.list costs 1 quota unit per video
-                
-                for video in videos_response['items']:
-                    if videos_found >= max_results:
-                        break
-                    
-                    video_info = self._parse_video_info(video)
-                    if video_info:
-                        yield video_info
-                        videos_found += 1
-                
-                # Check if there are more pages
-                next_page_token = search_response.get('nextPageToken')
-                if not next_page_token:
-                    break
-                
-                # Rate limiting
-                time.sleep(Config.RATE_LIMIT_DELAY)
+            def run_search(params: Dict) -> Dict:
+                try:
+                    self._spend(100)  # Search costs 100 quota units
+                    return self._execute(self.youtube.search().list(**params))
+                except QuotaExceededError as e:
+                    # Remember where the search stopped so a rerun can
+                    # resume without re-spending the earlier pages
+                    e.next_page_token = params.get('pageToken')
+                    raise
+            
+            # One helper thread keeps the next search page in flight while
+            # this thread resolves details and yields the current page
+            pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                search_future = pool.submit(run_search, dict(search_params))
+                pending_id_chunks: List[List[str]] = []
+                pending_count = 0
+                exhausted = False
+                resuming = 'pageToken' in search_params
+
+                while not exhausted and videos_found < max_results:
+                    try:
+                        search_response = search_future.result()
+                    except HttpError as e:
+                        if resuming and e.resp.status == 400:
+                            # The saved token has expired or been
+                            # invalidated; drop the stale record and
+                            # restart the query from page one instead of
+                            # wedging every future run on the same 400
+                            self._save_search_state(state_key, None)
+                            search_params.pop('pageToken', None)
+                            resuming = False
+                            search_future = pool.submit(run_search,
+                                                        dict(search_params))
+                            continue
+                        raise
+                    resuming = False
+
+                    next_page_token = search_response.get('nextPageToken')
+                    if not next_page_token:
+                        exhausted = True
+
+                    video_ids = [item['id']['videoId'] for item in search_response['items']]
+                    if video_ids:
+                        pending_id_chunks.append(video_ids)
+                        pending_count += len(video_ids)
+                    else:
+                        exhausted = True
+
+                    # Prefetch the next page only while more results are
+                    # demonstrably needed: a 100-unit search page fetched
+                    # speculatively when the pending IDs already cover the
+                    # remaining demand is pure quota waste
+                    covered = pending_count >= max_results - videos_found
+                    prefetching = False
+                    if next_page_token and not covered:
+                        next_params = dict(search_params, pageToken=next_page_token)
+                        search_future = pool.submit(run_search, next_params)
+                        prefetching = True
+
+                    # Resolve details two pages at a time (or as soon as
+                    # the demand is covered), coalescing the lookups into
+                    # one round-trip
+                    if pending_id_chunks and (exhausted or covered
+                                              or len(pending_id_chunks) >= 2):
+                        for video in self._fetch_video_details(pending_id_chunks):
+                            if videos_found >= max_results:
+                                break
+
+                            video_info = self._parse_video_info(video)
+                            if video_info:
+                                yield video_info
+                                videos_found += 1
+                        pending_id_chunks = []
+                        pending_count = 0
+
+                    if not pending_id_chunks:
+                        # Everything fetched so far has been yielded (or
+                        # filtered out), so a rerun may safely resume from
+                        # the next page — persisting any earlier would skip
+                        # videos an abandoned generator never delivered.
+                        # Exhaustion clears the record (or marks a date bin
+                        # permanently finished)
+                        self._save_search_state(state_key, next_page_token,
+                                                done=windowed and not next_page_token)
+
+                    # Filtering may have delivered fewer videos than the
+                    # pending IDs suggested; fetch the skipped page now
+                    # that the shortfall is known
+                    if (not exhausted and not prefetching
+                            and videos_found < max_results):
+                        next_params = dict(search_params, pageToken=next_page_token)
+                        search_future = pool.submit(run_search, next_params)
+
+            finally:
+                pool.shutdown(wait=False)
                 
         except HttpError as e:
             print(f"YouTube API error: {e}")
@@ -101,14 +445,119 @@ class YouTubeAPI:
                 print("Quota exceeded or API key invalid")
             raise
     
+    def search_videos_timesplit(self, query: str, start_iso: str, end_iso: str,
+                                bin_days: int = 7, **kwargs) -> Iterator[Dict]:
+        """Search a query across consecutive publication-date windows.
+
+        YouTube caps any single search at roughly 500 results, so
+        high-volume queries silently plateau. Binning the query by
+        publishedAfter/publishedBefore windows gets a full 500-result
+        budget per bin, at proportionally more quota. Completed bins are
+        remembered in the resume state, so an interrupted run restarts
+        at the bin where it stopped; duplicates straddling bin edges are
+        filtered out.
+
+        Args:
+            query: Search query string
+            start_iso: Window start, ISO date or date-time
+            end_iso: Window end, ISO date or date-time
+            bin_days: Width of each publication window in days
+            **kwargs: Passed through to search_videos
+        """
+        start = datetime.fromisoformat(start_iso.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(end_iso.replace('Z', '+00:00'))
+
+        seen_ids: set = set()
+        current = start
+        while current < end:
+            nxt = min(current + timedelta(days=bin_days), end)
+            for video in self.search_videos(
+                    query,
+                    published_after=current.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    published_before=nxt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    **kwargs):
+                video_id = video.get('video_id')
+                if video_id in seen_ids:
+                    continue
+                seen_ids.add(video_id)
+                yield video
+            current = nxt
+
+    def _fetch_video_details(self, id_chunks: List[List[str]]) -> List[Dict]:
+        """Fetch detail rows for one or more chunks of video IDs.
+
+        A single chunk goes out as a plain videos.list call; multiple
+        chunks ride one batched HTTP request, so several pages' lookups
+        share a round-trip. IDs with a fresh entry in the on-disk cache
+        are served from there and never hit the API at all. Results
+        keep chunk order.
+        """
+        detail_part = 'snippet,statistics,contentDetails,status'
+
+        requested = [vid for chunk in id_chunks for vid in chunk]
+        cached = self._detail_cache.get_fresh(requested)
+        missing = [vid for vid in requested if vid not in cached]
+        fetch_chunks = [missing[i:i + 50] for i in range(0, len(missing), 50)]
+
+        fetched: List[Dict] = []
+        if len(fetch_chunks) == 1:
+            ids_key = ','.join(fetch_chunks[0])
+            request = self.youtube.videos().list(part=detail_part, id=ids_key)
+            etag = self._detail_cache.get_list_etag(ids_key)
+            if etag:
+                request.headers['If-None-Match'] = etag
+            self._spend(1)  # Videos.list costs 1 quota unit per call
+            try:
+                response = self._execute(request)
+            except HttpError as e:
+                if etag and e.resp.status == 304:
+                    # Unchanged on the server: reuse the stored payloads
+                    # and restart their TTL instead of re-downloading
+                    self._detail_cache.refresh(fetch_chunks[0])
+                    cached.update(self._detail_cache.get_stale(fetch_chunks[0]))
+                else:
+                    raise
+            else:
+                fetched = response['items']
+                self._detail_cache.put_list_etag(ids_key, response.get('etag', ''))
+        elif fetch_chunks:
+            responses: Dict[str, Dict] = {}
+            errors: List[Exception] = []
+
+            def collect(request_id, response, exception):
+                if exception is not None:
+                    errors.append(exception)
+                else:
+                    responses[request_id] = response
+
+            self._spend(len(fetch_chunks))
+            batch = self.youtube.new_batch_http_request(callback=collect)
+            for chunk in fetch_chunks:
+                batch.add(self.youtube.videos().list(part=detail_part, id=','.join(chunk)))
+            self._execute(batch)
+
+            if errors:
+                raise errors[0]
+
+            # Batch request IDs are assigned '1', '2', ... in add() order
+            for request_id in sorted(responses, key=int):
+                fetched.extend(responses[request_id]['items'])
+
+        if fetched:
+            self._detail_cache.put_many(fetched)
+
+        by_id = {item['id']: item for item in fetched}
+        by_id.update(cached)
+        return [by_id[vid] for vid in requested if vid in by_id]
+    
     def get_video_details(self, video_id: str) -> Optional[Dict]:
         """Get detailed information for a specific video."""
         try:
-            response = self.youtube.videos().list(
+            self._spend(1)
+            response = self._execute(self.youtube.videos().list(
                 part='snippet,statistics,contentDetails,status',
                 id=video_id
-            ).execute()
-            self.quota_used += 1
+            ))
             
             if response['items']:
                 return self._parse_video_info(response['items'][0])
@@ -118,81 +567,118 @@ class YouTubeAPI:
             print(f"Error getting video details for {video_id}: {e}")
             return None
     
-    def get_channel_videos(self, channel_id: str, max_results: int = 50) -> Iterator[Dict]:
-        """Get videos from a specific channel."""
-        try:
-            # Get channel's uploads playlist
-            channel_response = self.youtube.channels().list(
+    def _uploads_playlist_ids(self, channel_ids: List[str]) -> Dict[str, str]:
+        """Resolve channels to their uploads playlist IDs.
+
+        Unknown channels are fetched in one comma-joined channels.list
+        call per 50 (1 quota unit each) and cached for the client's
+        lifetime, so re-runs over the same seed list cost nothing here.
+        """
+        missing = [c for c in channel_ids if c not in self._uploads_playlists]
+        for i in range(0, len(missing), 50):
+            self._spend(1)
+            response = self._execute(self.youtube.channels().list(
                 part='contentDetails',
-                id=channel_id
-            ).execute()
-            self.quota_used += 1
-            
-            if not channel_response['items']:
-                return
-            
-            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-            
-            # Get videos from uploads playlist
-            next_page_token = None
-            videos_found = 0
-            
-            while videos_found < max_results:
-                playlist_params = {
-                    'part': 'snippet',
-                    'playlistId': uploads_playlist_id,
-                    'maxResults': min(50, max_results - videos_found)
-                }
-                
-                if next_page_token:
-                    playlist_params['pageToken'] = next_page_token
-                
-                playlist_response = self.youtube.playlistItems().list(**playlist_params).execute()
-                self.quota_used += 1
-                
-                video_ids = [item['snippet']['resourceId']['videoId'] for item in playlist_response['items']]
-                
-                if not video_ids:
-                    break
-                
-                # Get detailed video information
-                videos_response = self.youtube.videos().list(
-                    part='snippet,statistics,contentDetails,status',
-                    id=','.join(video_ids)
-                ).execute()
-                self.quota_used += 1
-                
-                for video in videos_response['items']:
-                    if videos_found >= max_results:
-                        break
-                    
-                    video_info = self._parse_video_info(video)
-                    if video_info:
-                        yield video_info
-                        videos_found += 1
-                
-                next_page_token = playlist_response.get('nextPageToken')
-                if not next_page_token:
-                    break
-                
-                time.sleep(Config.RATE_LIMIT_DELAY)
-                
+                id=','.join(missing[i:i + 50])
+            ))
+            for item in response.get('items', []):
+                self._uploads_playlists[item['id']] = \
+                    item['contentDetails']['relatedPlaylists']['uploads']
+        return {c: self._uploads_playlists[c]
+                for c in channel_ids if c in self._uploads_playlists}
+
+    def get_channel_videos(self, channel_ids, max_results: int = 50) -> Iterator[Dict]:
+        """Get videos from one or more channels' uploads playlists.
+
+        Accepts a single channel ID or a list. Listing uploads costs
+        ~2 quota units per 50 videos (playlistItems.list + videos.list)
+        against 100 units for one search.list page, so this is the
+        cheap path for channels already known to carry Farsi content.
+        """
+        if isinstance(channel_ids, str):
+            channel_ids = [channel_ids]
+
+        try:
+            uploads = self._uploads_playlist_ids(channel_ids)
         except HttpError as e:
-            print(f"Error getting channel videos for {channel_id}: {e}")
+            print(f"Error resolving uploads playlists: {e}")
+            return
+
+        videos_found = 0
+
+        for channel_id in channel_ids:
+            if videos_found >= max_results:
+                break
+
+            uploads_playlist_id = uploads.get(channel_id)
+            if not uploads_playlist_id:
+                continue
+
+            try:
+                next_page_token = None
+
+                while videos_found < max_results:
+                    playlist_params = {
+                        'part': 'snippet',
+                        'playlistId': uploads_playlist_id,
+                        'maxResults': min(50, max_results - videos_found)
+                    }
+
+                    if next_page_token:
+                        playlist_params['pageToken'] = next_page_token
+
+                    self._spend(1)
+                    playlist_response = self._execute(self.youtube.playlistItems().list(**playlist_params))
+
+                    video_ids = [item['snippet']['resourceId']['videoId'] for item in playlist_response['items']]
+
+                    if not video_ids:
+                        break
+
+                    # Get detailed video information
+                    self._spend(1)
+                    videos_response = self._execute(self.youtube.videos().list(
+                        part='snippet,statistics,contentDetails,status',
+                        id=','.join(video_ids)
+                    ))
+
+                    for video in videos_response['items']:
+                        if videos_found >= max_results:
+                            break
+
+                        video_info = self._parse_video_info(video)
+                        if video_info:
+                            yield video_info
+                            videos_found += 1
+
+                    next_page_token = playlist_response.get('nextPageToken')
+                    if not next_page_token:
+                        break
+
+            except HttpError as e:
+                print(f"Error getting channel videos for {channel_id}: {e}")
     
     def _parse_video_info(self, video_data: Dict) -> Optional[Dict]:
         """Parse video data from YouTube API response."""
+        etag = video_data.get('etag')
+        cache_key = (video_data.get('id'), etag) if etag else None
+        if cache_key is not None and cache_key in self._parsed_cache:
+            cached = self._parsed_cache[cache_key]
+            # Copy so callers can't mutate the cached entry
+            return dict(cached) if cached is not None else None
+
         try:
             snippet = video_data['snippet']
             statistics = video_data.get('statistics', {})
             content_details = video_data.get('contentDetails', {})
-            
+
             # Parse duration
             duration_iso = content_details.get('duration', 'PT0S')
-            duration_seconds = int(isodate.parse_duration(duration_iso).total_seconds())
+            duration_seconds = _iso_to_seconds(duration_iso)
             
             # Filter by duration constraints
             if duration_seconds < Config.MIN_VIDEO_DURATION or duration_seconds > Config.MAX_VIDEO_DURATION:
+                self._remember_parse(cache_key, None)
                 return None
             
             video_info = {
@@ -210,15 +696,43 @@ class YouTubeAPI:
                 'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url', '')
             }
             
+            self._remember_parse(cache_key, video_info)
             return video_info
-            
+
         except Exception as e:
             print(f"Error parsing video info: {e}")
             return None
+
+    def _remember_parse(self, cache_key, video_info: Optional[Dict]):
+        """Store a parse result, evicting the oldest entry past 4096."""
+        if cache_key is None:
+            return
+        if len(self._parsed_cache) >= 4096:
+            self._parsed_cache.pop(next(iter(self._parsed_cache)))
+        self._parsed_cache[cache_key] = dict(video_info) if video_info is not None else None
     
     def search_farsi_videos(self, max_results: int = 100) -> Iterator[Dict]:
-        """Search for Farsi videos using predefined keywords and strategies."""
-        
+        """Search for Farsi videos, preferring cheap channel listings.
+
+        Seed channels (Config.FARSI_SEED_CHANNELS) are harvested first
+        through their uploads playlists at ~2 quota units per 50 videos;
+        the 100-unit-per-page keyword searches only run to cold-start
+        discovery or top up whatever the seeds could not fill.
+        """
+        total_found = 0
+
+        if Config.FARSI_SEED_CHANNELS:
+            try:
+                for video in self.get_channel_videos(
+                        list(Config.FARSI_SEED_CHANNELS), max_results=max_results):
+                    yield video
+                    total_found += 1
+            except Exception as e:
+                print(f"Error collecting from seed channels: {e}")
+
+        if total_found >= max_results:
+            return
+
         # Search strategies for Farsi content
         search_queries = [
             # Direct Farsi keywords
@@ -240,9 +754,8 @@ class YouTubeAPI:
             'مستند ایرانی'
         ]
         
-        videos_per_query = max(1, max_results // len(search_queries))
-        total_found = 0
-        
+        videos_per_query = max(1, (max_results - total_found) // len(search_queries))
+
         for query in search_queries:
             if total_found >= max_results:
                 break
@@ -2,13 +2,20 @@
 YouTube page scraper for extracting video information and related videos.
 """
 
+import os
 import re
+import json
 import time
+import array
+import queue
 import logging
-from typing import Dict, List, Optional, Set
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse, parse_qs
 import requests
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -20,22 +27,167 @@ from fake_useragent import UserAgent
 from langdetect import detect, DetectorFactory
 from langdetect.lang_detect_exception import LangDetectException
 
+from .config import contains_any_farsi_keyword, normalize_farsi
+
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
 logger = logging.getLogger(__name__)
 
+try:
+    # google-re2's DFA engine scans in linear time; the stdlib engine is a
+    # drop-in fallback for these patterns
+    import re2 as _re
+except ImportError:
+    _re = re
+
+# Compiled once at import: these run on every URL and every title or
+# description seen during a crawl. The host alternation is factored so
+# the engine matches 'youtube.com/' once instead of per branch.
+_ID_RE = _re.compile(
+    r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})')
+
+
+@lru_cache(maxsize=16384)
+def _extract_video_id_cached(url: str) -> Optional[str]:
+    """ID extraction memoized: BFS sees the same related URLs many
+    times before the visited set dedupes them."""
+    match = _ID_RE.search(url)
+    return match.group(1) if match else None
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# Watch pages embed their data as an inline JSON blob; parsing it
+# replaces a full browser render for most pages
+_YT_INITIAL_DATA_RE = re.compile(r'var ytInitialData\s*=\s*({.*?});</script>', re.DOTALL)
+
+# Precompiled XPaths for the related-video sidebar: one page_source dump
+# walked in-process instead of a CDP round-trip per element
+_REL_NODES_XPATH = lxml_html.etree.XPath('//ytd-compact-video-renderer')
+_REL_HREF_XPATH = lxml_html.etree.XPath(".//a[@id='thumbnail']/@href")
+_REL_TITLE_XPATH = lxml_html.etree.XPath(".//*[@id='video-title']//text()")
+_REL_CHANNEL_XPATH = lxml_html.etree.XPath(".//*[@id='channel-name']//a//text()")
+
+# The chromedriver install check (downloads and version probing) runs
+# once per process, not once per scraper instance — parallel crawls
+# spin up one scraper per worker
+_CHROMEDRIVER_PATH = None
+_CHROMEDRIVER_LOCK = threading.Lock()
+
+
+def _chromedriver_path() -> str:
+    global _CHROMEDRIVER_PATH
+    with _CHROMEDRIVER_LOCK:
+        if _CHROMEDRIVER_PATH is None:
+            _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+        return _CHROMEDRIVER_PATH
+
+
+# fasttext's language-ID model classifies a whole batch in one C++
+# forward pass; loaded lazily, False marks a failed load
+_FASTTEXT_LID = None
+
+
+def _fasttext_lid():
+    """Load the fasttext LID model once; None when unavailable."""
+    global _FASTTEXT_LID
+    if _FASTTEXT_LID is None:
+        try:
+            import fasttext
+            _FASTTEXT_LID = fasttext.load_model(
+                os.getenv('FASTTEXT_LID_MODEL', 'lid.176.ftz'))
+        except Exception:
+            _FASTTEXT_LID = False
+    return _FASTTEXT_LID or None
+
+
+# isalpha truth table for the Basic Multilingual Plane, built on first
+# use so importing this module stays cheap
+_ALPHA_TABLE = None
+
+
+def _alpha_table():
+    global _ALPHA_TABLE
+    if _ALPHA_TABLE is None:
+        _ALPHA_TABLE = _np.frombuffer(
+            bytes(chr(cp).isalpha() for cp in range(0x10000)), dtype=_np.uint8)
+    return _ALPHA_TABLE
+
+
+# Per-codepoint truth tables for the short-text counting path, also
+# built lazily: indexing a bytes object from map() keeps the loop in C
+_CHAR_LUTS = None
+
+
+def _char_luts():
+    global _CHAR_LUTS
+    if _CHAR_LUTS is None:
+        persian = bytearray(0x10000)
+        for lo, hi in FarsiDetector._PERSIAN_RANGES:
+            for cp in range(lo, hi + 1):
+                persian[cp] = 1
+        alpha = bytes(chr(cp).isalpha() for cp in range(0x10000))
+        _CHAR_LUTS = (bytes(persian), alpha)
+    return _CHAR_LUTS
+
 
 class FarsiDetector:
     """Detect Farsi/Persian text in strings."""
     
     # Persian/Farsi Unicode ranges
     PERSIAN_CHARS = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
-    
+
+    # The same blocks as inclusive codepoint ranges, for the vectorized counter
+    _PERSIAN_RANGES = ((0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF),
+                       (0xFB50, 0xFDFF), (0xFE70, 0xFEFF))
+
+    @classmethod
+    def count_persian_and_alpha(cls, text: str) -> Tuple[int, int]:
+        """Count Persian letters and letters overall in one pass.
+
+        With NumPy available, long texts are viewed as a UTF-32
+        codepoint array and both counts come from vectorized range
+        comparisons and a table lookup over C memory; short texts and
+        NumPy-less environments index per-codepoint truth tables
+        instead, which beats both regex scans and the array-conversion
+        overhead at title lengths.
+        """
+        if _np is None or len(text) < 256:
+            persian_lut, alpha_lut = _char_luts()
+            units = array.array('H')
+            units.frombytes(text.encode('utf-16-le'))
+            persian = sum(map(persian_lut.__getitem__, units))
+            alpha = sum(map(alpha_lut.__getitem__, units))
+            if len(units) != len(text):
+                # Astral-plane chars arrive as surrogate pairs, which
+                # the tables score as zero; count their letters directly
+                alpha += sum(1 for c in text
+                             if ord(c) >= 0x10000 and c.isalpha())
+            return persian, alpha
+
+        cp = _np.frombuffer(text.encode('utf-32-le'), dtype=_np.uint32)
+        persian_mask = (cp >= 0x0600) & (cp <= 0x06FF)
+        for lo, hi in cls._PERSIAN_RANGES[1:]:
+            persian_mask |= (cp >= lo) & (cp <= hi)
+
+        bmp = cp < 0x10000
+        alpha = int(_alpha_table()[cp[bmp]].sum())
+        if not bmp.all():
+            # Astral-plane codepoints (emoji, rare scripts) are scarce
+            # enough to classify one by one
+            alpha += sum(1 for c in cp[~bmp] if chr(int(c)).isalpha())
+
+        return int(persian_mask.sum()), alpha
+
     @classmethod
     def has_farsi_chars(cls, text: str) -> bool:
         """Check if text contains Persian/Farsi characters."""
-        if not text:
+        # Most sidebar titles are pure ASCII; str.isascii() rejects those
+        # without paying for the regex scan.
+        if not text or text.isascii():
             return False
         return bool(cls.PERSIAN_CHARS.search(text))
     
@@ -43,39 +195,153 @@ class FarsiDetector:
     def detect_farsi(cls, text: str, min_farsi_ratio: float = 0.1) -> bool:
         """
         Detect if text is primarily in Farsi.
-        
+
         Args:
             text: Text to analyze
             min_farsi_ratio: Minimum ratio of Farsi characters required
-            
+
         Returns:
             True if text is detected as Farsi
         """
-        if not text or len(text.strip()) < 3:
-            return False
-        
-        # First check for Persian characters
-        if not cls.has_farsi_chars(text):
-            return False
-        
-        # Calculate ratio of Persian characters
-        persian_chars = len(cls.PERSIAN_CHARS.findall(text))
-        total_chars = len([c for c in text if c.isalpha()])
-        
-        if total_chars == 0:
-            return False
-        
-        farsi_ratio = persian_chars / total_chars
-        
-        # Use langdetect as secondary check
-        try:
-            detected_lang = detect(text)
-            if detected_lang == 'fa':  # Persian language code
-                return True
-        except LangDetectException:
-            pass
-        
-        return farsi_ratio >= min_farsi_ratio
+        # Detection is pure, and the same titles recur constantly across
+        # related-video sidebars, so results are memoized
+        return _detect_farsi_cached(text, min_farsi_ratio)
+
+    @classmethod
+    def detect_farsi_batch(cls, texts: List[str],
+                           min_farsi_ratio: float = 0.1) -> List[bool]:
+        """Classify many texts at once.
+
+        Conclusive regex/ratio verdicts never touch a language model;
+        the ambiguous remainder goes through fasttext's LID model in a
+        single batched forward pass when the model is available, or
+        through langdetect one by one otherwise.
+        """
+        results = [False] * len(texts)
+        pending = []  # (index, normalized text, ratio)
+
+        for i, text in enumerate(texts):
+            verdict, ambiguous = _fast_farsi_verdict(text)
+            if verdict is not None:
+                results[i] = verdict
+            else:
+                pending.append((i, *ambiguous))
+
+        if not pending:
+            return results
+
+        model = _fasttext_lid()
+        if model is not None:
+            labels, _ = model.predict(
+                [text.replace('\n', ' ')[:512] for _, text, _ in pending], k=1)
+            for (i, _, ratio), label in zip(pending, labels):
+                results[i] = (bool(label) and label[0] == '__label__fa'
+                              or ratio >= min_farsi_ratio)
+        else:
+            for i, text, ratio in pending:
+                try:
+                    results[i] = (detect(text[:512]) == 'fa'
+                                  or ratio >= min_farsi_ratio)
+                except LangDetectException:
+                    results[i] = ratio >= min_farsi_ratio
+
+        return results
+
+
+def _fast_farsi_verdict(text: str):
+    """Cheap regex/ratio classification shared by all detection paths.
+
+    Returns (verdict, ambiguous): verdict is True/False when the text is
+    conclusively classified; verdict is None — with the normalized text
+    and its Persian-char ratio in `ambiguous` — when a language model
+    has to arbitrate.
+    """
+    if not text or len(text.strip()) < 3:
+        return False, None
+
+    # Canonicalize Arabic/Persian codepoint variants once, so the keyword
+    # and character checks below are exact comparisons
+    text = normalize_farsi(text)
+
+    # First check for Persian characters
+    if not FarsiDetector.has_farsi_chars(text):
+        return False, None
+
+    # A known Farsi keyword is a conclusive signal; skip the ratio and
+    # langdetect work entirely
+    if contains_any_farsi_keyword(text):
+        return True, None
+
+    # Calculate ratio of Persian characters in one pass
+    persian_chars, total_chars = FarsiDetector.count_persian_and_alpha(text)
+
+    if total_chars == 0:
+        return False, None
+
+    farsi_ratio = persian_chars / total_chars
+
+    # The ratio alone settles the obvious cases; the model only
+    # arbitrates the ambiguous band
+    if farsi_ratio >= 0.5:
+        return True, None
+    if farsi_ratio < 0.02:
+        return False, None
+
+    return None, (text, farsi_ratio)
+
+
+@lru_cache(maxsize=65536)
+def _detect_farsi_cached(text: str, min_farsi_ratio: float) -> bool:
+    """Cached implementation behind FarsiDetector.detect_farsi."""
+    verdict, ambiguous = _fast_farsi_verdict(text)
+    if verdict is not None:
+        return verdict
+
+    text, farsi_ratio = ambiguous
+
+    # Capped: langdetect's accuracy plateaus long before 512 chars
+    # while its cost grows linearly with length
+    try:
+        if detect(text[:512]) == 'fa':  # Persian language code
+            return True
+    except LangDetectException:
+        pass
+
+    return farsi_ratio >= min_farsi_ratio
+
+
+class VideoColumns:
+    """Column-oriented accumulator for scraped video records.
+
+    Stores each field as its own list instead of one dict per video:
+    the accumulator holds a dozen compact lists rather than hundreds of
+    per-row dicts, and field-level scans (is_farsi filters, score
+    aggregates) read one contiguous list apiece. to_records()
+    re-materializes dicts for callers that expect row records.
+    """
+
+    FIELDS = ('video_id', 'url', 'title', 'description', 'channel',
+              'channel_url', 'views', 'duration', 'upload_date',
+              'is_farsi', 'farsi_score', 'related_videos')
+
+    def __init__(self):
+        self._columns: Dict[str, List] = {name: [] for name in self.FIELDS}
+
+    def append(self, record: Dict):
+        for name in self.FIELDS:
+            self._columns[name].append(record.get(name))
+
+    def column(self, name: str) -> List:
+        """Direct access to one field across all rows."""
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns['video_id'])
+
+    def to_records(self) -> List[Dict]:
+        names = self.FIELDS
+        return [dict(zip(names, row))
+                for row in zip(*(self._columns[name] for name in names))]
 
 
 class YouTubeScraper:
@@ -94,6 +360,9 @@ class YouTubeScraper:
         self.ua = UserAgent()
         self.session = requests.Session()
         self.driver = None
+        # There is one browser instance; discovery workers that miss the
+        # HTTP fast path take turns on it
+        self._driver_lock = threading.Lock()
         self.farsi_detector = FarsiDetector()
         
         # Set up session headers
@@ -122,13 +391,25 @@ class YouTubeScraper:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Text is all the Farsi detector reads; skip image and font fetches
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.fonts': 2,
+        })
         
         try:
             self.driver = webdriver.Chrome(
-                service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
+                service=webdriver.chrome.service.Service(_chromedriver_path()),
                 options=chrome_options
             )
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            try:
+                # Keep the HTTP cache warm across navigations so shared
+                # page assets aren't re-fetched on every BFS hop
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+            except Exception as e:
+                logger.debug(f"Could not tune browser caching: {e}")
             return self.driver
         except Exception as e:
             logger.error(f"Failed to setup Chrome driver: {e}")
@@ -136,16 +417,7 @@ class YouTubeScraper:
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract YouTube video ID from URL."""
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/v/([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        return _extract_video_id_cached(url)
     
     def scrape_video_page(self, video_url: str) -> Dict:
         """
@@ -162,27 +434,34 @@ class YouTubeScraper:
             raise ValueError(f"Invalid YouTube URL: {video_url}")
         
         logger.info(f"Scraping video: {video_id}")
-        
+
         try:
-            driver = self._setup_driver()
-            driver.get(video_url)
-            
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "title"))
-            )
-            
-            # Wait a bit more for dynamic content
-            time.sleep(3)
-            
-            # Extract video information
-            video_info = self._extract_video_info(driver, video_id, video_url)
-            
-            # Extract related videos
-            related_videos = self._extract_related_videos(driver)
-            
+            # One GET plus a JSON parse covers most watch pages; the
+            # browser only spins up when the inline data is missing
+            video_info = self._fetch_video_info_http(video_url)
+            if video_info is not None:
+                return video_info
+
+            with self._driver_lock:
+                driver = self._setup_driver()
+                driver.get(video_url)
+
+                # Wait for page to load
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "title"))
+                )
+
+                # Wait a bit more for dynamic content
+                time.sleep(3)
+
+                # Extract video information
+                video_info = self._extract_video_info(driver, video_id, video_url)
+
+                # Extract related videos
+                related_videos = self._extract_related_videos(driver)
+
             video_info['related_videos'] = related_videos
-            
+
             return video_info
             
         except Exception as e:
@@ -193,9 +472,122 @@ class YouTubeScraper:
                 'error': str(e),
                 'related_videos': []
             }
-        finally:
-            time.sleep(self.delay)
     
+    def _fetch_video_info_http(self, video_url: str) -> Optional[Dict]:
+        """Fetch and parse a watch page over plain HTTP.
+
+        A single session GET and one json.loads of the inline
+        ytInitialData blob yield the same fields the Selenium path
+        scrapes out of the rendered DOM, without the browser startup,
+        the multi-second render waits, or the per-worker Chrome
+        footprint. Returns None whenever the blob is missing or has an
+        unexpected shape, so the caller can fall back to the browser.
+        """
+        video_id = self.extract_video_id(video_url)
+
+        try:
+            response = self.session.get(video_url, timeout=10)
+            response.raise_for_status()
+            match = _YT_INITIAL_DATA_RE.search(response.text)
+            if not match:
+                return None
+            data = json.loads(match.group(1))
+        except Exception as e:
+            logger.debug(f"HTTP fast path failed for {video_url}: {e}")
+            return None
+
+        info = {
+            'video_id': video_id,
+            'url': video_url,
+            'title': '',
+            'description': '',
+            'channel': '',
+            'channel_url': '',
+            'views': '',
+            'duration': '',
+            'upload_date': '',
+            'is_farsi': False,
+            'farsi_score': 0.0,
+            'related_videos': []
+        }
+
+        try:
+            watch_next = data['contents']['twoColumnWatchNextResults']
+            contents = watch_next['results']['results']['contents']
+        except (KeyError, TypeError):
+            return None
+
+        for renderer in contents:
+            primary = renderer.get('videoPrimaryInfoRenderer')
+            if primary:
+                runs = primary.get('title', {}).get('runs', [])
+                info['title'] = ''.join(run.get('text', '') for run in runs).strip()
+                info['views'] = (primary.get('viewCount', {})
+                                 .get('videoViewCountRenderer', {})
+                                 .get('viewCount', {}).get('simpleText', ''))
+
+            secondary = renderer.get('videoSecondaryInfoRenderer')
+            if secondary:
+                owner = secondary.get('owner', {}).get('videoOwnerRenderer', {})
+                owner_runs = owner.get('title', {}).get('runs', [])
+                if owner_runs:
+                    info['channel'] = owner_runs[0].get('text', '').strip()
+                    base_url = (owner_runs[0].get('navigationEndpoint', {})
+                                .get('browseEndpoint', {}).get('canonicalBaseUrl', ''))
+                    if base_url:
+                        info['channel_url'] = f"https://www.youtube.com{base_url}"
+
+                # Newer pages carry attributedDescription, older ones runs
+                description = secondary.get('attributedDescription', {}).get('content', '')
+                if not description:
+                    description = ''.join(
+                        run.get('text', '')
+                        for run in secondary.get('description', {}).get('runs', []))
+                info['description'] = description.strip()
+
+        if not info['title']:
+            return None
+
+        text_to_check = f"{info['title']} {info['description']}"
+        info['is_farsi'] = self.farsi_detector.detect_farsi(text_to_check)
+        farsi_chars, total_chars = self.farsi_detector.count_persian_and_alpha(text_to_check)
+        info['farsi_score'] = farsi_chars / total_chars if total_chars > 0 else 0.0
+
+        try:
+            results = watch_next['secondaryResults']['secondaryResults']['results']
+        except (KeyError, TypeError):
+            results = []
+
+        for item in results[:20]:
+            renderer = item.get('compactVideoRenderer')
+            if not renderer or not renderer.get('videoId'):
+                continue
+
+            related_id = renderer['videoId']
+            title = renderer.get('title', {}).get('simpleText', '')
+            if not title:
+                title = ''.join(run.get('text', '')
+                                for run in renderer.get('title', {}).get('runs', []))
+            channel = ''.join(run.get('text', '')
+                              for run in renderer.get('longBylineText', {}).get('runs', []))
+
+            info['related_videos'].append({
+                'video_id': related_id,
+                'url': f"https://www.youtube.com/watch?v={related_id}",
+                'title': title.strip(),
+                'channel': channel.strip(),
+            })
+
+        # One batched classification for the whole sidebar
+        flags = self.farsi_detector.detect_farsi_batch(
+            [f"{v['title']} {v['channel']}" for v in info['related_videos']])
+        for related, is_farsi in zip(info['related_videos'], flags):
+            related['is_farsi'] = is_farsi
+
+        logger.info(f"Fetched info for {video_id} over HTTP: {info['title'][:50]}... "
+                    f"(Farsi: {info['is_farsi']})")
+        return info
+
     def _extract_video_info(self, driver: webdriver.Chrome, video_id: str, video_url: str) -> Dict:
         """Extract video metadata from the page."""
         info = {
@@ -253,8 +645,7 @@ class YouTubeScraper:
             
             # Calculate Farsi score
             if text_to_check:
-                farsi_chars = len(self.farsi_detector.PERSIAN_CHARS.findall(text_to_check))
-                total_chars = len([c for c in text_to_check if c.isalpha()])
+                farsi_chars, total_chars = self.farsi_detector.count_persian_and_alpha(text_to_check)
                 info['farsi_score'] = farsi_chars / total_chars if total_chars > 0 else 0.0
             
             logger.info(f"Extracted info for {video_id}: {info['title'][:50]}... (Farsi: {info['is_farsi']})")
@@ -267,12 +658,58 @@ class YouTubeScraper:
     def _extract_related_videos(self, driver: webdriver.Chrome) -> List[Dict]:
         """Extract related videos from the sidebar."""
         related_videos = []
-        
+
         try:
             # Scroll to load more related videos
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
             time.sleep(2)
-            
+
+            # One page_source dump parsed by lxml replaces dozens of
+            # per-element find_element round-trips to the browser
+            tree = lxml_html.fromstring(driver.page_source)
+            for node in _REL_NODES_XPATH(tree)[:20]:
+                hrefs = _REL_HREF_XPATH(node)
+                if not hrefs or 'watch?v=' not in hrefs[0]:
+                    continue
+
+                video_url = urljoin('https://www.youtube.com', hrefs[0])
+                video_id = self.extract_video_id(video_url)
+                if not video_id:
+                    continue
+
+                title = ''.join(_REL_TITLE_XPATH(node)).strip()
+                channel = ''.join(_REL_CHANNEL_XPATH(node)).strip()
+
+                related_videos.append({
+                    'video_id': video_id,
+                    'url': video_url,
+                    'title': title,
+                    'channel': channel,
+                })
+
+            # Classify the whole sidebar in one batched call
+            flags = self.farsi_detector.detect_farsi_batch(
+                [f"{v['title']} {v['channel']}" for v in related_videos])
+            for video, is_farsi in zip(related_videos, flags):
+                video['is_farsi'] = is_farsi
+
+            if not related_videos:
+                # Markup not in the expected shape; fall back to the
+                # selector-by-selector walk
+                related_videos = self._extract_related_videos_css(driver)
+
+            logger.info(f"Found {len(related_videos)} related videos")
+
+        except Exception as e:
+            logger.error(f"Error extracting related videos: {e}")
+
+        return related_videos
+
+    def _extract_related_videos_css(self, driver: webdriver.Chrome) -> List[Dict]:
+        """Selector-based sidebar extraction, kept as the slow path."""
+        related_videos = []
+
+        try:
             # Find related video elements
             video_elements = driver.find_elements(By.CSS_SELECTOR, "#related #dismissible")
             
@@ -318,60 +755,107 @@ class YouTubeScraper:
                 except Exception as e:
                     logger.debug(f"Error extracting related video: {e}")
                     continue
-            
-            logger.info(f"Found {len(related_videos)} related videos")
-            
+
         except Exception as e:
             logger.error(f"Error extracting related videos: {e}")
-        
+
         return related_videos
     
-    def find_farsi_videos(self, start_url: str, max_videos: int = 50) -> List[Dict]:
+    def find_farsi_videos(self, start_url: str, max_videos: int = 50,
+                          workers: int = 4) -> List[Dict]:
         """
         Find Farsi videos starting from a given URL.
-        
+
+        Discovery runs as a breadth-first search fanned out over a small
+        worker pool: each worker pulls a URL from the shared frontier,
+        fetches it (HTTP fast path, shared pooled session), and feeds the
+        Farsi-passing related videos back into the queue. The pages are
+        independent, so the per-page waits overlap instead of adding up.
+
         Args:
             start_url: Starting YouTube video URL
             max_videos: Maximum number of videos to collect
-            
+            workers: Number of concurrent page fetchers
+
         Returns:
             List of Farsi video information
         """
-        farsi_videos = []
-        visited_urls = set()
-        urls_to_visit = [start_url]
-        
+        # Columnar accumulator: appends stay cheap under the lock and
+        # records only materialize once, on return
+        farsi_videos = VideoColumns()
+        visited_urls: Set[str] = set()
+        lock = threading.Lock()
+        # maxsize carries over the old 100-URL frontier cap; overflow
+        # candidates are simply dropped
+        urls_to_visit: 'queue.Queue[str]' = queue.Queue(maxsize=100)
+        urls_to_visit.put(start_url)
+        pending = [1]  # URLs queued or in progress, guarded by lock
+
+        # One shared inter-request wait: the pool as a whole starts one
+        # fetch per delay, instead of every worker sleeping after every
+        # page the way the old per-URL sleep did
+        pace_lock = threading.Lock()
+        next_slot = [time.monotonic()]
+
+        def pace():
+            if self.delay <= 0:
+                return
+            with pace_lock:
+                now = time.monotonic()
+                wait = next_slot[0] - now
+                next_slot[0] = max(now, next_slot[0]) + self.delay
+            if wait > 0:
+                time.sleep(wait)
+
         logger.info(f"Starting Farsi video discovery from: {start_url}")
-        
-        while urls_to_visit and len(farsi_videos) < max_videos:
-            current_url = urls_to_visit.pop(0)
-            
-            if current_url in visited_urls:
-                continue
-            
-            visited_urls.add(current_url)
-            
-            try:
-                video_info = self.scrape_video_page(current_url)
-                
-                if video_info.get('is_farsi', False):
-                    farsi_videos.append(video_info)
-                    logger.info(f"Found Farsi video {len(farsi_videos)}: {video_info.get('title', '')[:50]}...")
-                
-                # Add related Farsi videos to queue
-                for related in video_info.get('related_videos', []):
-                    if related.get('is_farsi', False) and related['url'] not in visited_urls:
-                        urls_to_visit.append(related['url'])
-                
-                # Limit queue size
-                urls_to_visit = urls_to_visit[:100]
-                
-            except Exception as e:
-                logger.error(f"Error processing {current_url}: {e}")
-                continue
-        
+
+        def worker():
+            while True:
+                try:
+                    current_url = urls_to_visit.get(timeout=0.5)
+                except queue.Empty:
+                    with lock:
+                        if pending[0] == 0 or len(farsi_videos) >= max_videos:
+                            return
+                    continue
+
+                try:
+                    with lock:
+                        if current_url in visited_urls or len(farsi_videos) >= max_videos:
+                            continue
+                        visited_urls.add(current_url)
+
+                    pace()
+                    video_info = self.scrape_video_page(current_url)
+
+                    with lock:
+                        if video_info.get('is_farsi', False) and len(farsi_videos) < max_videos:
+                            farsi_videos.append(video_info)
+                            logger.info(f"Found Farsi video {len(farsi_videos)}: "
+                                        f"{video_info.get('title', '')[:50]}...")
+
+                        # Add related Farsi videos to the frontier
+                        for related in video_info.get('related_videos', []):
+                            if related.get('is_farsi', False) and related['url'] not in visited_urls:
+                                try:
+                                    urls_to_visit.put_nowait(related['url'])
+                                    pending[0] += 1
+                                except queue.Full:
+                                    break
+
+                except Exception as e:
+                    logger.error(f"Error processing {current_url}: {e}")
+                finally:
+                    with lock:
+                        pending[0] -= 1
+
+        worker_count = max(1, min(workers, max_videos))
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            for future in [executor.submit(worker) for _ in range(worker_count)]:
+                future.result()
+
         logger.info(f"Discovery complete. Found {len(farsi_videos)} Farsi videos.")
-        return farsi_videos
+        return farsi_videos.to_records()[:max_videos]
     
     def close(self):
         """Close the browser driver."""